@@ -10,15 +10,18 @@ async def main():
         page = await browser.new_page()
         
         print(f"Navigating to {url}...")
-        await page.goto(url, wait_until="networkidle", timeout=30000)
+        await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+        
+        # Wait for the listing itself instead of for the network to go idle
+        await page.wait_for_selector("main li:has(time)", state="attached", timeout=10000)
         
         # Get page title
         title = await page.title()
         print(f"\nPage Title: {title}")
         
-        # Get all text content
-        content = await page.content()
-        print(f"\nPage has {len(content)} characters of HTML")
+        # Measure the HTML in the page instead of transferring it
+        html_length = await page.evaluate("() => document.documentElement.outerHTML.length")
+        print(f"\nPage has {html_length} characters of HTML")
         
         # Try to find movie-related content
         text = await page.inner_text('body')
@@ -27,15 +30,19 @@ async def main():
         print(text[:2000])  # First 2000 chars
         print("="*80)
         
-        # Look for specific elements
-        links = await page.locator('a').all()
-        print(f"\nFound {len(links)} links")
+        # Look for specific elements (collected in a single page call)
+        links = await page.eval_on_selector_all(
+            'a',
+            """(els) => ({
+                count: els.length,
+                items: els.slice(0, 10).map(e => ({href: e.getAttribute('href'), text: e.innerText.trim()})),
+            })"""
+        )
+        print(f"\nFound {links['count']} links")
         
-        for link in links[:10]:
-            href = await link.get_attribute('href')
-            text = await link.inner_text()
-            if text.strip():
-                print(f"  - {text.strip()[:50]} -> {href}")
+        for link in links['items']:
+            if link['text']:
+                print(f"  - {link['text'][:50]} -> {link['href']}")
         
         await browser.close()
 
@@ -5,8 +5,8 @@ Provides browser automation capabilities using Playwright for handling
 JavaScript-rendered content, cookie consent dialogs, and content extraction.
 """
 
-from .browser_engine import BrowserAutomationEngine
+from .browser_engine import BrowserAutomationEngine, BrowserPool
 from .consent_handler import CookieConsentHandler
 from .content_extractor import ContentExtractor
 
-__all__ = ['BrowserAutomationEngine', 'CookieConsentHandler', 'ContentExtractor']
+__all__ = ['BrowserAutomationEngine', 'BrowserPool', 'CookieConsentHandler', 'ContentExtractor']
@@ -5,22 +5,189 @@ Manages browser lifecycle, context creation, and provides core automation
 capabilities with proper resource management and error handling.
 """
 
+from __future__ import annotations
+
 import asyncio
+import json
 import logging
-from typing import Optional, Dict, Any
-from pathlib import Path
-
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
-
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import re
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional, Dict, Any
 
 from models import BrowserConfig
 
+if TYPE_CHECKING:
+    # Playwright is imported lazily by the methods that launch a browser
+    from playwright.async_api import Browser, BrowserContext, Page, Playwright
+
 
 logger = logging.getLogger(__name__)
 
+# URL patterns for blocked resource types. Routing on these keeps every other
+# request inside the browser instead of calling back into Python for it.
+IMAGE_URL_PATTERN = re.compile(r'\.(png|jpe?g|gif|webp|avif|svg|ico)(\?|$)', re.IGNORECASE)
+FONT_URL_PATTERN = re.compile(r'\.(woff2?|ttf|otf|eot)(\?|$)', re.IGNORECASE)
+
+# URL pattern routed to abort for each blockable resource type
+BLOCKED_TYPE_PATTERNS = {
+    'image': IMAGE_URL_PATTERN,
+    'font': FONT_URL_PATTERN,
+}
+
+# Init script adding preconnect/dns-prefetch hints for the origins in the
+# injected JSON array as soon as the top-level document has a <head>.
+PRECONNECT_SCRIPT = """
+(() => {
+    if (window !== window.top) return;
+    const origins = %s;
+    const addHints = () => {
+        for (const origin of origins) {
+            for (const rel of ['preconnect', 'dns-prefetch']) {
+                const link = document.createElement('link');
+                link.rel = rel;
+                link.href = origin;
+                document.head.appendChild(link);
+            }
+        }
+    };
+    if (document.head) {
+        addHints();
+        return;
+    }
+    new MutationObserver((_, observer) => {
+        if (document.head) {
+            observer.disconnect();
+            addHints();
+        }
+    }).observe(document, { childList: true, subtree: true });
+})();
+"""
+
+
+async def _abort_route(route) -> None:
+    """Route handler that drops the request."""
+    await route.abort()
+
+
+# Chromium flags tuned for fast headless start-up and low per-page overhead
+LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--no-zygote',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-features=Translate,BackForwardCache,AcceptCHFrame',
+    '--no-first-run',
+    '--no-default-browser-check'
+]
+
+
+async def _launch_browser(playwright: Playwright, config: BrowserConfig) -> Browser:
+    """Launch Chromium with the shared command-line configuration."""
+    return await playwright.chromium.launch(
+        headless=config.headless,
+        args=LAUNCH_ARGS,
+        chromium_sandbox=False,
+        handle_sigint=False
+    )
+
+
+class BrowserPool:
+    """
+    Shares one Playwright driver and browser between engines.
+    
+    Launching Chromium costs far more than opening a context, so the pool
+    starts the browser once and hands out browser contexts, keeping released
+    contexts in an idle queue for reuse. At most ``config.max_contexts``
+    contexts are checked out at the same time. All contexts are assumed to
+    use the same settings.
+    """
+    
+    def __init__(self, config: Optional[BrowserConfig] = None):
+        self.config = config or BrowserConfig()
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self._idle: asyncio.Queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.config.max_contexts)
+        self._launch_lock = asyncio.Lock()
+    
+    async def get_browser(self) -> Browser:
+        """
+        Returns the shared browser, launching it on first use.
+        
+        Returns:
+            Browser: Shared Playwright browser instance
+        """
+        async with self._launch_lock:
+            if self.browser is None:
+                logger.info("Launching pooled browser...")
+                from playwright.async_api import async_playwright
+                self.playwright = await async_playwright().start()
+                self.browser = await _launch_browser(self.playwright, self.config)
+        return self.browser
+    
+    async def acquire(
+        self, factory: Callable[[Browser], Awaitable[BrowserContext]]
+    ) -> BrowserContext:
+        """
+        Checks out a browser context, waiting while the pool is at capacity.
+        
+        Args:
+            factory: Creates a new context when no idle one is available
+            
+        Returns:
+            BrowserContext: Idle or newly created browser context
+        """
+        await self._slots.acquire()
+        try:
+            try:
+                return self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                return await factory(await self.get_browser())
+        except Exception:
+            self._slots.release()
+            raise
+    
+    async def release(self, context: BrowserContext) -> None:
+        """
+        Returns a context to the pool after clearing its cookies and pages.
+        
+        Args:
+            context: Context previously returned by acquire()
+        """
+        try:
+            await context.clear_cookies()
+            for page in context.pages:
+                await page.close()
+            self._idle.put_nowait(context)
+        except Exception as e:
+            logger.warning(f"Discarding pooled context that failed to reset: {e}")
+            try:
+                await context.close()
+            except Exception:
+                pass
+        finally:
+            self._slots.release()
+    
+    async def close(self) -> None:
+        """Closes idle contexts, the shared browser and the Playwright driver."""
+        while not self._idle.empty():
+            try:
+                await self._idle.get_nowait().close()
+            except Exception as e:
+                logger.warning(f"Error closing pooled context: {e}")
+        
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+            
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        
+        logger.info("Browser pool closed")
+
 
 class BrowserAutomationEngine:
     """
@@ -28,15 +195,25 @@ class BrowserAutomationEngine:
     
     Handles browser initialization, context creation, navigation, and proper
     resource cleanup with comprehensive error handling and logging.
+    
+    When a BrowserPool is given, the browser is borrowed from the pool and
+    contexts are checked out and returned instead of launched and closed.
     """
     
-    def __init__(self, config: Optional[BrowserConfig] = None):
+    def __init__(self, config: Optional[BrowserConfig] = None, pool: Optional[BrowserPool] = None):
         self.config = config or BrowserConfig()
+        self.pool = pool
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
         self._is_initialized = False
         
+        # Resource types to block, resolved once from the config
+        self._blocked_types: frozenset[str] = frozenset(
+            t for t, on in (('image', self.config.block_images), ('font', self.config.block_fonts)) if on
+        )
+        
     async def initialize_browser(self) -> Browser:
         """
         Creates and configures browser instance.
@@ -50,19 +227,14 @@ class BrowserAutomationEngine:
         try:
             logger.info("Initializing Playwright browser...")
             
-            self.playwright = await async_playwright().start()
-            
-            # Launch browser with configuration
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.config.headless,
-                args=[
-                    '--no-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-gpu',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor'
-                ]
-            )
+            if self.pool:
+                self.browser = await self.pool.get_browser()
+            else:
+                from playwright.async_api import async_playwright
+                self.playwright = await async_playwright().start()
+                
+                # Launch browser with configuration
+                self.browser = await _launch_browser(self.playwright, self.config)
             
             self._is_initialized = True
             logger.info(f"Browser initialized successfully (headless={self.config.headless})")
@@ -90,25 +262,11 @@ class BrowserAutomationEngine:
         try:
             logger.debug("Creating browser context...")
             
-            # Context configuration
-            context_options = {
-                'viewport': {
-                    'width': self.config.viewport_width,
-                    'height': self.config.viewport_height
-                },
-                'user_agent': self.config.user_agent,
-                'java_script_enabled': self.config.enable_javascript,
-                'ignore_https_errors': True,
-            }
-            
-            # Remove None values
-            context_options = {k: v for k, v in context_options.items() if v is not None}
-            
-            self.context = await self.browser.new_context(**context_options)
-            
-            # Configure resource blocking for performance
-            if self.config.block_images or self.config.block_fonts:
-                await self._setup_resource_blocking()
+            if self.pool:
+                self.context = await self.pool.acquire(self._new_context)
+            else:
+                self.context = await self._new_context(self.browser)
+            self.page = None
             
             logger.debug("Browser context created successfully")
             return self.context
@@ -117,12 +275,71 @@ class BrowserAutomationEngine:
             logger.error(f"Failed to create browser context: {e}")
             raise RuntimeError(f"Context creation failed: {e}")
     
-    async def navigate_to_page(self, url: str) -> Page:
+    async def _new_context(self, browser: Browser) -> BrowserContext:
+        """Opens a new context on the browser with the configured settings."""
+        # Context configuration
+        context_options = {
+            'viewport': {
+                'width': self.config.viewport_width,
+                'height': self.config.viewport_height
+            },
+            'user_agent': self.config.user_agent,
+            'java_script_enabled': self.config.enable_javascript,
+            'ignore_https_errors': True,
+        }
+        
+        # Remove None values
+        context_options = {k: v for k, v in context_options.items() if v is not None}
+        
+        context = await browser.new_context(**context_options)
+        
+        # Configure resource blocking for performance
+        if self._blocked_types:
+            await self._setup_resource_blocking(context)
+        
+        # Warm up connections to known third-party origins
+        if self.config.preconnect_origins:
+            await context.add_init_script(
+                PRECONNECT_SCRIPT % json.dumps(list(self.config.preconnect_origins))
+            )
+        
+        return context
+    
+    async def get_page(self) -> Page:
+        """
+        Returns the context's page, creating it on first use.
+        
+        The same page is reused across navigations, so callers can start
+        waiting on it before navigate_to_page() is called.
+        
+        Returns:
+            Page: Playwright page instance
+            
+        Raises:
+            RuntimeError: If context not created
+        """
+        if not self.context:
+            raise RuntimeError("Browser context must be created before opening a page")
+            
+        if self.page is None or self.page.is_closed():
+            self.page = await self.context.new_page()
+            
+            # Set timeouts
+            self.page.set_default_timeout(self.config.timeout_element_wait)
+            self.page.set_default_navigation_timeout(self.config.timeout_page_load)
+            
+        return self.page
+    
+    async def navigate_to_page(self, url: str, wait_until: str = 'commit') -> Page:
         """
         Navigates to target URL with proper error handling.
         
+        Returns once the response headers arrive by default, so callers can
+        wait for the elements they need while the document is still loading.
+        
         Args:
             url: Target URL to navigate to
+            wait_until: Playwright load state to wait for before returning
             
         Returns:
             Page: Playwright page instance
@@ -136,14 +353,10 @@ class BrowserAutomationEngine:
         try:
             logger.info(f"Navigating to: {url}")
             
-            page = await self.context.new_page()
-            
-            # Set timeouts
-            page.set_default_timeout(self.config.timeout_element_wait)
-            page.set_default_navigation_timeout(self.config.timeout_page_load)
+            page = await self.get_page()
             
             # Navigate to URL
-            response = await page.goto(url, wait_until='domcontentloaded')
+            response = await page.goto(url, wait_until=wait_until)
             
             if not response or response.status >= 400:
                 raise RuntimeError(f"Navigation failed with status: {response.status if response else 'No response'}")
@@ -155,22 +368,11 @@ class BrowserAutomationEngine:
             logger.error(f"Navigation to {url} failed: {e}")
             raise RuntimeError(f"Navigation failed: {e}")
     
-    async def _setup_resource_blocking(self):
+    async def _setup_resource_blocking(self, context: BrowserContext):
         """Set up resource blocking for improved performance."""
-        if not self.context:
-            return
-            
-        async def route_handler(route, request):
-            resource_type = request.resource_type
+        for resource_type in self._blocked_types:
+            await context.route(BLOCKED_TYPE_PATTERNS[resource_type], _abort_route)
             
-            # Block images and fonts if configured
-            if (self.config.block_images and resource_type == 'image') or \
-               (self.config.block_fonts and resource_type == 'font'):
-                await route.abort()
-            else:
-                await route.continue_()
-        
-        await self.context.route('**/*', route_handler)
         logger.debug("Resource blocking configured")
     
     async def cleanup(self) -> None:
@@ -183,10 +385,19 @@ class BrowserAutomationEngine:
         logger.info("Cleaning up browser resources...")
         
         try:
+            self.page = None
+            
             if self.context:
-                await self.context.close()
+                if self.pool:
+                    await self.pool.release(self.context)
+                else:
+                    await self.context.close()
                 self.context = None
                 logger.debug("Browser context closed")
+            
+            if self.pool:
+                # The pool owns the shared browser and Playwright driver
+                self.browser = None
                 
             if self.browser:
                 await self.browser.close()
@@ -204,6 +415,7 @@ class BrowserAutomationEngine:
         except Exception as e:
             logger.error(f"Error during browser cleanup: {e}")
             # Force cleanup even if errors occur
+            self.page = None
             self.context = None
             self.browser = None
             self.playwright = None
@@ -5,22 +5,75 @@ Detects and automatically handles cookie consent dialogs using common patterns
 and provides comprehensive logging for debugging consent handling issues.
 """
 
-import asyncio
-import logging
-from typing import Optional, List
-from pathlib import Path
-
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from __future__ import annotations
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import logging
+import re
+from typing import TYPE_CHECKING, ClassVar, Optional, Pattern, Tuple
 
 from models import ConsentResult
+from .screenshots import debug_screenshot_path
+
+if TYPE_CHECKING:
+    # Playwright is imported lazily where its exceptions are caught
+    from playwright.async_api import Page
 
 
 logger = logging.getLogger(__name__)
 
+# Returns the first selector with a visible match, or null so that
+# page.wait_for_function keeps polling until the timeout.
+FIRST_VISIBLE_SELECTOR_JS = """
+(selectors) => {
+    for (const selector of selectors) {
+        for (const el of document.querySelectorAll(selector)) {
+            const style = window.getComputedStyle(el);
+            if (el.getClientRects().length > 0 && style.visibility !== 'hidden') {
+                return selector;
+            }
+        }
+    }
+    return null;
+}
+"""
+
+# Clicks the first visible, enabled consent button in the page and returns
+# the selector that matched (or "label:<button label>" when the button was
+# found by its accessible name), or null so that page.wait_for_function
+# keeps polling until the timeout. Known vendor selectors are tried first,
+# then accept labels, then the generic attribute/class fallbacks.
+CLICK_CONSENT_JS = """
+({selectors, pattern, flags, fallbacks}) => {
+    const clickable = (el) => !el.disabled
+        && el.getClientRects().length > 0
+        && window.getComputedStyle(el).visibility !== 'hidden';
+    const clickFirst = (list) => {
+        for (const selector of list) {
+            for (const el of document.querySelectorAll(selector)) {
+                if (clickable(el)) {
+                    el.click();
+                    return selector;
+                }
+            }
+        }
+        return null;
+    };
+    const vendor = clickFirst(selectors);
+    if (vendor !== null) {
+        return vendor;
+    }
+    const label = new RegExp(pattern, flags);
+    for (const el of document.querySelectorAll('button, [role="button"]')) {
+        const name = (el.getAttribute('aria-label') || el.textContent || '').replace(/\\s+/g, ' ').trim();
+        if (label.test(name) && clickable(el)) {
+            el.click();
+            return `label:${name}`;
+        }
+    }
+    return clickFirst(fallbacks);
+}
+"""
+
 
 class CookieConsentHandler:
     """
@@ -31,7 +84,7 @@ class CookieConsentHandler:
     """
     
     # Prioritized list of consent button selectors
-    CONSENT_SELECTORS = [
+    CONSENT_SELECTORS: ClassVar[Tuple[str, ...]] = (
         # CookieBot
         '#CybotCookiebotDialogBodyLevelButtonLevelOptinAllowAll',
         
@@ -39,19 +92,12 @@ class CookieConsentHandler:
         '#onetrust-accept-btn-handler',
         
         # Cookieyes
-        '.cky-btn-accept',
-        
-        # Swedish-specific patterns
-        'button:has-text("Godkänn alla kakor")',
-        'button:has-text("Acceptera alla kakor")',
-        'button:has-text("Godkänn alla")',
-        
-        # Generic accept patterns
-        'button:has-text("Accept all")',
-        'button:has-text("Acceptera alla")',
-        'button:has-text("Accept")',
-        'button:has-text("Acceptera")',
-        
+        '.cky-btn-accept'
+    )
+    
+    # Tried only after the accept-label pass, since these also match
+    # unrelated elements
+    FALLBACK_SELECTORS: ClassVar[Tuple[str, ...]] = (
         # Attribute-based fallbacks
         '[data-testid*="accept"]',
         '[id*="accept"]',
@@ -63,10 +109,18 @@ class CookieConsentHandler:
         '.consent-accept',
         '.accept-all',
         '.btn-accept'
-    ]
+    )
+    
+    # Accept button labels ("Godkänn alla kakor", "Acceptera alla", "Accept all",
+    # "Godkänn alla kakor och fortsätt", ...), matched against the start of
+    # the button's accessible name
+    _ACCEPT_RE: ClassVar[Pattern[str]] = re.compile(
+        r"^(godkänn|acceptera|accept)(\s+(alla|all))?(\s+(kakor|cookies))?",
+        re.IGNORECASE
+    )
     
     # Dialog detection selectors
-    DIALOG_SELECTORS = [
+    DIALOG_SELECTORS: ClassVar[Tuple[str, ...]] = (
         '[role="dialog"]',
         'dialog',  # HTML5 dialog element
         '.cookie-banner',
@@ -78,7 +132,9 @@ class CookieConsentHandler:
         '[class*="consent"]',
         '[id*="cookie"]',
         '[id*="consent"]'
-    ]
+    )
+    
+    JOINED_DIALOG: ClassVar[str] = ", ".join(DIALOG_SELECTORS)
     
     def __init__(self, timeout: int = 10000, screenshot_on_failure: bool = True):
         self.timeout = timeout
@@ -94,27 +150,28 @@ class CookieConsentHandler:
         Returns:
             bool: True if consent dialog is detected
         """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
         try:
             logger.debug("Detecting consent dialog...")
             
-            for selector in self.DIALOG_SELECTORS:
-                try:
-                    element = await page.wait_for_selector(
-                        selector, 
-                        timeout=2000,  # Short timeout for each selector
-                        state='visible'
-                    )
-                    if element:
-                        logger.info(f"Consent dialog detected with selector: {selector}")
-                        return True
-                except PlaywrightTimeoutError:
-                    continue
-                    
+            # Probe every selector in a single in-page poll instead of one
+            # wait_for_selector round-trip (and timeout) per selector
+            handle = await page.wait_for_function(
+                FIRST_VISIBLE_SELECTOR_JS,
+                arg=self.DIALOG_SELECTORS,
+                timeout=2000  # Short timeout shared by all selectors
+            )
+            selector = await handle.json_value()
+            logger.info("Consent dialog detected with selector: %s", selector)
+            return True
+            
+        except PlaywrightTimeoutError:
             logger.debug("No consent dialog detected")
             return False
             
         except Exception as e:
-            logger.error(f"Error detecting consent dialog: {e}")
+            logger.error("Error detecting consent dialog: %s", e)
             return False
     
     async def handle_consent(self, page: Page) -> ConsentResult:
@@ -127,75 +184,52 @@ class CookieConsentHandler:
         Returns:
             ConsentResult: Result of consent handling attempt
         """
-        result = ConsentResult(success=False)
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
+        dialog_detected = False
         
         try:
             logger.info("Attempting to handle cookie consent...")
             
-            # First detect if dialog exists
-            result.dialog_detected = await self.detect_consent_dialog(page)
-            
-            if not result.dialog_detected:
+            # Find and click the button in one in-page call; a clickable
+            # consent button appearing is the dialog signal
+            try:
+                handle = await page.wait_for_function(
+                    CLICK_CONSENT_JS,
+                    arg={
+                        'selectors': self.CONSENT_SELECTORS,
+                        'pattern': self._ACCEPT_RE.pattern,
+                        'flags': 'i',
+                        'fallbacks': self.FALLBACK_SELECTORS
+                    },
+                    timeout=self.timeout
+                )
+            except PlaywrightTimeoutError:
                 logger.info("No consent dialog detected, proceeding...")
-                result.success = True
-                result.method_used = "no_dialog_detected"
-                return result
-            
-            # Try each consent selector
-            for i, selector in enumerate(self.CONSENT_SELECTORS):
-                try:
-                    logger.debug(f"Trying consent selector {i+1}/{len(self.CONSENT_SELECTORS)}: {selector}")
-                    
-                    # Wait for the button to be visible and clickable
-                    button = await page.wait_for_selector(
-                        selector,
-                        timeout=2000,  # Short timeout per selector
-                        state='visible'
-                    )
-                    
-                    if button:
-                        # Check if button is enabled
-                        is_enabled = await button.is_enabled()
-                        if not is_enabled:
-                            logger.debug(f"Button found but disabled: {selector}")
-                            continue
-                        
-                        # Click the consent button
-                        await button.click()
-                        logger.info(f"Successfully clicked consent button: {selector}")
-                        
-                        # Wait for dialog to disappear
-                        await self.wait_for_consent_completion(page)
-                        
-                        result.success = True
-                        result.method_used = selector
-                        return result
-                        
-                except PlaywrightTimeoutError:
-                    logger.debug(f"Selector not found: {selector}")
-                    continue
-                except Exception as e:
-                    logger.debug(f"Error with selector {selector}: {e}")
-                    continue
-            
-            # If we get here, no consent button was found
-            logger.warning("No clickable consent button found")
-            result.error_message = "No clickable consent button found"
-            
-            # Take screenshot for debugging if enabled
-            if self.screenshot_on_failure:
-                result.screenshot_path = await self._take_debug_screenshot(page)
+                return ConsentResult(success=True, method_used="no_dialog_detected")
+            
+            selector = await handle.json_value()
+            dialog_detected = True
+            logger.info("Successfully clicked consent button: %s", selector)
+            
+            # Wait for dialog to disappear
+            await self.wait_for_consent_completion(page)
             
-            return result
+            return ConsentResult(success=True, method_used=selector, dialog_detected=True)
             
         except Exception as e:
-            logger.error(f"Error handling consent: {e}")
-            result.error_message = str(e)
+            logger.error("Error handling consent: %s", e)
             
+            screenshot_path = None
             if self.screenshot_on_failure:
-                result.screenshot_path = await self._take_debug_screenshot(page)
+                screenshot_path = await self._take_debug_screenshot(page)
             
-            return result
+            return ConsentResult(
+                success=False,
+                error_message=str(e),
+                screenshot_path=screenshot_path,
+                dialog_detected=dialog_detected
+            )
     
     async def wait_for_consent_completion(self, page: Page) -> None:
         """
@@ -204,28 +238,34 @@ class CookieConsentHandler:
         Args:
             page: Playwright page instance
         """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+        
         try:
             logger.debug("Waiting for consent dialog to disappear...")
             
-            # Wait for any of the dialog selectors to become hidden
-            for selector in self.DIALOG_SELECTORS:
-                try:
-                    await page.wait_for_selector(
-                        selector,
-                        timeout=3000,
-                        state='hidden'
-                    )
-                    logger.debug(f"Dialog disappeared: {selector}")
-                    break
-                except PlaywrightTimeoutError:
-                    continue
-            
-            # Additional wait for page to stabilize
-            await page.wait_for_timeout(1000)
+            # Wait once for the first dialog match to become hidden
+            try:
+                await page.locator(self.JOINED_DIALOG).first.wait_for(
+                    state='hidden',
+                    timeout=3000
+                )
+                logger.debug("Dialog disappeared")
+            except PlaywrightTimeoutError:
+                logger.debug("Dialog still visible after consent click")
+            
+            # Wait (at most 1s) until no open dialog remains rather than
+            # sleeping for a fixed second
+            try:
+                await page.wait_for_function(
+                    "() => !document.querySelector('[role=dialog]:not([hidden])')",
+                    timeout=1000
+                )
+            except PlaywrightTimeoutError:
+                logger.debug("Dialog still present after consent click")
             logger.info("Consent handling completed")
             
         except Exception as e:
-            logger.warning(f"Error waiting for consent completion: {e}")
+            logger.warning("Error waiting for consent completion: %s", e)
     
     async def _take_debug_screenshot(self, page: Page) -> Optional[str]:
         """
@@ -238,17 +278,13 @@ class CookieConsentHandler:
             Optional[str]: Path to screenshot file if successful
         """
         try:
-            screenshot_dir = Path("debug_screenshots")
-            screenshot_dir.mkdir(exist_ok=True)
-            
-            timestamp = asyncio.get_event_loop().time()
-            screenshot_path = screenshot_dir / f"consent_failure_{timestamp}.png"
+            screenshot_path = debug_screenshot_path("consent_failure")
             
             await page.screenshot(path=str(screenshot_path), full_page=True)
-            logger.info(f"Debug screenshot saved: {screenshot_path}")
+            logger.info("Debug screenshot saved: %s", screenshot_path)
             
             return str(screenshot_path)
             
         except Exception as e:
-            logger.error(f"Failed to take debug screenshot: {e}")
+            logger.error("Failed to take debug screenshot: %s", e)
             return None
\ No newline at end of file
@@ -20,18 +20,21 @@ The "Senast ändrad" (last changed) date is in:
   — text content only, no datetime attribute.
 """
 
+from __future__ import annotations
+
 import logging
 import re
-from typing import Optional
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 from datetime import datetime
-
-from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
-
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from urllib.parse import urljoin
 
 from models import MovieData, ExtractionConfig
+from .screenshots import debug_screenshot_path
+
+if TYPE_CHECKING:
+    # Playwright is imported lazily where its exceptions are caught
+    from playwright.async_api import Page
 
 
 logger = logging.getLogger(__name__)
@@ -43,6 +46,56 @@ SWEDISH_MONTHS = {
     'september': '09', 'oktober': '10', 'november': '11', 'december': '12',
 }
 
+# Title cleanup patterns
+_WS_RE = re.compile(r'\s+')
+_THROWBACK_RE = re.compile(r'^Throwback Thursday:\s*', re.IGNORECASE)
+_JUBILEUM_RE = re.compile(r'\s+\d+-årsjubileum', re.IGNORECASE)
+_YEAR_PAREN_RE = re.compile(r'\s*\((\d{4})\)\s*')
+
+# Screening time text, either "2026-05-28 19.00" or "28 maj 19.00"
+# (also "28 maj kl. 19.00"); one pass, dispatched on match.lastgroup.
+# ISO times are always zero-padded; the Swedish form may not be.
+_ISO_DATETIME = r'(?P<iso>(?P<date>\d{4}-\d{2}-\d{2})\s+(?P<h1>\d{2})[.:](?P<m1>\d{2}))'
+_SWEDISH_DATETIME = (
+    r'(?P<sv>(?P<day>\d{1,2})\s+(?P<mon>' + '|'.join(SWEDISH_MONTHS) + r')'
+    r'(?:\s+kl\.?)?\s*(?P<h2>\d{1,2})[.:](?P<m2>\d{2}))'
+)
+_DATETIME_RE = re.compile(_ISO_DATETIME + '|' + _SWEDISH_DATETIME, re.IGNORECASE)
+# Text without a '-' cannot hold an ISO date, so only the Swedish form is tried
+_SWEDISH_DATETIME_RE = re.compile(_SWEDISH_DATETIME, re.IGNORECASE)
+# "19 december, 2025"
+_SWEDISH_DATE_RE = re.compile(r'(\d{1,2})\s+([a-zåäö]+),?\s+(\d{4})', re.IGNORECASE)
+
+# A <time> element's datetime attribute and text content in one page call
+TIME_ATTR_AND_TEXT_JS = "el => [el.getAttribute('datetime'), el.textContent]"
+# The first listing item's <time> ([datetime attribute, text]) and every
+# <a href> in it ([href, text] pairs) in one page call; null if no item
+LISTING_ITEM_JS = """
+(selector) => {
+    const li = document.querySelector(selector);
+    if (!li) return null;
+    const time = li.querySelector('time');
+    return {
+        time: [time.getAttribute('datetime'), time.textContent],
+        links: Array.from(li.querySelectorAll('a[href]'), e => [e.getAttribute('href'), e.textContent || '']),
+    };
+}
+"""
+
+# Fields a screening needs before it can be announced
+REQUIRED_FIELDS = ('title', 'screening_datetime', 'location', 'booking_url')
+# Normalised screening time, "2026-05-28 19:00"
+_SCREENING_DATETIME_RE = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}$')
+
+# The first <li> in the main content that holds a <time> (the screening entry)
+_LISTING_ITEM_SELECTOR = 'main li:has(time)'
+# "Senast ändrad" <time>: the <time> following the "Senast ändrad:" label,
+# then any <time> in the footer block (which may also hold "Publicerad")
+_LAST_CHANGED_SELECTORS = (
+    'strong:has-text("Senast ändrad") + time, strong:has-text("Senast ändrad:") ~ time',
+    '.sv-font-uppdaterad-info-ny time',
+)
+
 
 class ContentExtractor:
     """
@@ -64,15 +117,25 @@ class ContentExtractor:
     # Public API
     # ------------------------------------------------------------------
 
-    async def wait_for_content_load(self, page: Page) -> None:
-        """Wait for the page listing to be present in the DOM."""
+    async def wait_for_content_load(self, page: Page, ready_selector: Optional[str] = None) -> None:
+        """
+        Wait for the page listing to be present in the DOM.
+
+        The listing is server-rendered, so the ready selector only has to be
+        attached, not visible; defaults to ExtractionConfig.ready_selector.
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+        selector = ready_selector or self.config.ready_selector
         try:
-            # The listing is server-rendered so domcontentloaded is enough,
-            # but we wait for the first <li> in the main content area to be safe.
-            await page.wait_for_selector('main li', timeout=10000)
-            logger.debug("Content loaded — listing <li> elements found")
+            await page.wait_for_selector(
+                selector,
+                state='attached',
+                timeout=10000
+            )
+            logger.debug(f"Content loaded — {selector!r} found")
         except PlaywrightTimeoutError:
-            logger.warning("Timed out waiting for listing <li>; proceeding anyway")
+            logger.warning(f"Timed out waiting for {selector!r}; proceeding anyway")
 
     async def extract_movie_data(self, page: Page) -> MovieData:
         """
@@ -82,37 +145,40 @@ class ContentExtractor:
         """
         logger.info("Extracting movie data from main page listing...")
 
+        now = datetime.now()
+        current_url = page.url
         movie_data = MovieData(
-            extracted_at=datetime.now(),
-            source_url=page.url,
+            extracted_at=now,
+            source_url=current_url,
         )
 
-        # Find all <li> elements in the main content listing
-        # The listing sits inside the main content area; we target the
-        # first <li> that contains a <time> element (the screening entry).
-        listing_items = await page.query_selector_all('main li')
-
-        target_li = None
-        for li in listing_items:
-            time_el = await li.query_selector('time')
-            if time_el:
-                target_li = li
-                break
-
-        if not target_li:
-            logger.error("No listing <li> with a <time> element found on page")
+        # The listing sits inside the main content area; read the first
+        # <li> that contains a <time> element (the screening entry) — its
+        # time and all of its links — in a single page call instead of one
+        # round-trip per element.
+        try:
+            item = await page.evaluate(LISTING_ITEM_JS, _LISTING_ITEM_SELECTOR)
+        except Exception as e:
+            # e.g. a navigation racing the call or a closed target
+            logger.warning(f"Error reading the listing item: {e}")
+            item = None
+        else:
+            if not item:
+                logger.error("No listing <li> with a <time> element found on page")
+
+        if not item:
+            if self.config.screenshot_on_failure:
+                await self.take_extraction_screenshot(page)
             return movie_data
 
-        # --- Title & movie detail URL ---
-        movie_data.title, movie_data.movie_url = await self._extract_title_and_url(
-            target_li, page
-        )
-
         # --- Screening date/time ---
-        movie_data.screening_datetime = await self._extract_screening_datetime(target_li)
+        dt_attr, text = item['time']
+        movie_data.screening_datetime = self._parse_screening_datetime(dt_attr, text, now)
 
-        # --- Booking URL ---
-        movie_data.booking_url = await self._extract_booking_url(target_li)
+        # --- Title & movie detail URL, booking URL ---
+        links = item['links']
+        movie_data.title, movie_data.movie_url = self._extract_title_and_url(links, current_url)
+        movie_data.booking_url = self._extract_booking_url(links)
 
         # --- Location (hardcoded — always the same venue) ---
         movie_data.location = "Borås Bio Röda Kvarn"
@@ -124,6 +190,35 @@ class ContentExtractor:
         )
         return movie_data
 
+    async def validate_extracted_data(self, movie_data: MovieData) -> Dict[str, Any]:
+        """
+        Check extracted movie data for missing or malformed fields.
+
+        Works on the MovieData alone (converted to a dict once) — no
+        further page calls.
+
+        Returns a dict with 'is_valid' (all required fields present),
+        'missing_fields' and 'warnings'.
+        """
+        fields = asdict(movie_data)
+        missing_fields = [name for name in REQUIRED_FIELDS if not fields[name]]
+        warnings = []
+
+        screening_datetime = fields['screening_datetime']
+        if screening_datetime and not _SCREENING_DATETIME_RE.match(screening_datetime):
+            warnings.append(f"Unexpected screening datetime format: {screening_datetime!r}")
+        booking_url = fields['booking_url']
+        if booking_url and not booking_url.startswith(('http://', 'https://')):
+            warnings.append(f"Booking URL is not absolute: {booking_url!r}")
+        if not fields['movie_url']:
+            warnings.append("No movie detail URL found")
+
+        return {
+            'is_valid': not missing_fields,
+            'missing_fields': missing_fields,
+            'warnings': warnings,
+        }
+
     async def extract_last_changed_date(self, page: Page) -> Optional[str]:
         """
         Extract the 'Senast ändrad' (last changed) date from the page footer.
@@ -134,21 +229,20 @@ class ContentExtractor:
         Returns an ISO-format date string (YYYY-MM-DD) or None.
         """
         try:
-            # Find the <time> element that immediately follows "Senast ändrad:"
-            time_el = await page.query_selector('strong:has-text("Senast ändrad") + time, '
-                                                 'strong:has-text("Senast ändrad:") ~ time')
-            if not time_el:
-                # Broader fallback: find any <time> in the page footer area
-                time_el = await page.query_selector('.sv-font-uppdaterad-info-ny time')
+            time_el = None
+            for selector in _LAST_CHANGED_SELECTORS:
+                time_el = await page.query_selector(selector)
+                if time_el:
+                    break
 
             if time_el:
+                dt_attr, text = await time_el.evaluate(TIME_ATTR_AND_TEXT_JS)
+
                 # Try datetime attribute first (may not be present)
-                dt_attr = await time_el.get_attribute('datetime')
                 if dt_attr:
                     return dt_attr
 
                 # Fall back to text content: "19 december, 2025"
-                text = await time_el.text_content()
                 if text:
                     parsed = self._parse_swedish_date(text.strip())
                     if parsed:
@@ -157,111 +251,102 @@ class ContentExtractor:
         except Exception as e:
             logger.debug(f"Could not extract last changed date: {e}")
 
-        # Final fallback: use current timestamp so we always have a value
-        return datetime.now().isoformat()
+        # No usable footer: report it rather than inventing a timestamp,
+        # which would look like a site change on every run
+        logger.warning("Could not find the 'Senast ändrad' date on the page")
+        return None
+
+    async def take_extraction_screenshot(self, page: Page) -> Optional[str]:
+        """
+        Take a full-page screenshot for debugging extraction failures.
+
+        Returns the screenshot path, or None if it could not be taken.
+        """
+        try:
+            screenshot_path = debug_screenshot_path("extraction_failure")
+            await page.screenshot(path=str(screenshot_path), full_page=True)
+            logger.info(f"Extraction debug screenshot saved: {screenshot_path}")
+            return str(screenshot_path)
+
+        except Exception as e:
+            logger.error(f"Failed to take extraction screenshot: {e}")
+            return None
 
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
-    async def _extract_title_and_url(self, li, page: Page):
+    def _extract_title_and_url(self, links: List[Tuple[str, str]], page_url: str):
         """
         Extract the movie title and detail URL from the first non-booking link in the <li>.
 
         The title link text looks like:
           'Throwback Thursday: "Stand by Me" 40-årsjubileum (1986)'
         """
-        title = None
-        movie_url = None
+        for href, text in links:
+            if not href or not text:
+                continue
 
-        try:
-            # All <a> elements in the <li>
-            links = await li.query_selector_all('a[href]')
-            for link in links:
-                href = await link.get_attribute('href')
-                text = await link.text_content()
-
-                if not href or not text:
-                    continue
-
-                # Skip the booking link (points to bio.se or contains "Köp")
-                if 'bio.se' in href or 'köp' in text.lower() or 'biljett' in text.lower():
-                    continue
-
-                # Skip venue/location links
-                if 'borasbiorodakvarn' in href and 'throwback' not in href:
-                    continue
-
-                raw_title = text.strip()
-                title = self._clean_title(raw_title)
-
-                # Build absolute URL
-                if href.startswith('/'):
-                    base = f"{page.url.split('/')[0]}//{page.url.split('/')[2]}"
-                    movie_url = base + href
-                elif href.startswith('http'):
-                    movie_url = href
-                else:
-                    movie_url = '/'.join(page.url.split('/')[:-1]) + '/' + href
-
-                logger.debug(f"Title link found: {title!r} → {movie_url}")
-                break
+            # Skip the booking link (points to bio.se or contains "Köp")
+            lowered = text.lower()
+            if 'bio.se' in href or 'köp' in lowered or 'biljett' in lowered:
+                continue
 
-        except Exception as e:
-            logger.warning(f"Error extracting title/URL: {e}")
+            # Skip venue/location links
+            if 'borasbiorodakvarn' in href and 'throwback' not in href:
+                continue
+
+            title = self._clean_title(text.strip())
+
+            # Build absolute URL; urljoin handles root-relative, relative
+            # and protocol-relative hrefs alike
+            if href.startswith(('http://', 'https://')):
+                movie_url = href
+            else:
+                movie_url = urljoin(page_url, href)
 
-        return title, movie_url
+            logger.debug(f"Title link found: {title!r} → {movie_url}")
+            return title, movie_url
 
-    async def _extract_screening_datetime(self, li) -> Optional[str]:
+        return None, None
+
+    def _parse_screening_datetime(
+        self, dt_attr: Optional[str], text: Optional[str], now: Optional[datetime] = None
+    ) -> Optional[str]:
         """
-        Extract screening date/time from the <time> element inside the <li>.
+        Parse the screening date/time from the listing's <time> element.
 
         The text content is like "28 maj 19.00" — no datetime attribute.
         Returns a normalised string like "2026-05-28 19:00".
         """
-        try:
-            time_el = await li.query_selector('time')
-            if time_el:
-                # Try datetime attribute first
-                dt_attr = await time_el.get_attribute('datetime')
-                if dt_attr:
-                    try:
-                        dt = datetime.fromisoformat(dt_attr.replace('Z', '+00:00'))
-                        return dt.strftime('%Y-%m-%d %H:%M')
-                    except ValueError:
-                        pass
-
-                # Parse text content: "28 maj 19.00"
-                text = await time_el.text_content()
-                if text:
-                    parsed = self._parse_swedish_datetime(text.strip())
-                    if parsed:
-                        return parsed
-
-        except Exception as e:
-            logger.warning(f"Error extracting screening datetime: {e}")
+        # Try datetime attribute first
+        if dt_attr:
+            try:
+                dt = datetime.fromisoformat(dt_attr.replace('Z', '+00:00'))
+                return dt.strftime('%Y-%m-%d %H:%M')
+            except ValueError:
+                pass
+
+        # Parse text content: "28 maj 19.00"
+        if text:
+            parsed = self._parse_swedish_datetime(text.strip(), now)
+            if parsed:
+                return parsed
 
         return None
 
-    async def _extract_booking_url(self, li) -> Optional[str]:
+    def _extract_booking_url(self, links: List[Tuple[str, str]]) -> Optional[str]:
         """
         Extract the booking URL — the link to bio.se or the "Köp biljett" link.
         """
-        try:
-            links = await li.query_selector_all('a[href]')
-            for link in links:
-                href = await link.get_attribute('href')
-                text = (await link.text_content() or '').lower()
+        for href, text in links:
+            if not href:
+                continue
 
-                if not href:
-                    continue
-
-                if 'bio.se' in href or 'köp' in text or 'biljett' in text:
-                    logger.debug(f"Booking URL found: {href}")
-                    return href
-
-        except Exception as e:
-            logger.warning(f"Error extracting booking URL: {e}")
+            lowered = text.lower()
+            if 'bio.se' in href or 'köp' in lowered or 'biljett' in lowered:
+                logger.debug(f"Booking URL found: {href}")
+                return href
 
         return None
 
@@ -278,18 +363,18 @@ class ContentExtractor:
             return None
 
         # Strip leading/trailing whitespace and normalise internal spaces
-        text = re.sub(r'\s+', ' ', raw).strip()
+        text = _WS_RE.sub(' ', raw).strip()
 
         # Remove "Throwback Thursday: " prefix
-        text = re.sub(r'^Throwback Thursday:\s*', '', text, flags=re.IGNORECASE).strip()
+        text = _THROWBACK_RE.sub('', text).strip()
 
         # Remove anniversary/jubileum suffixes like "40-årsjubileum"
-        text = re.sub(r'\s+\d+-årsjubileum', '', text, flags=re.IGNORECASE).strip()
+        text = _JUBILEUM_RE.sub('', text).strip()
 
         # Extract year in parentheses if present, then remove it from title
-        year_match = re.search(r'\((\d{4})\)', text)
+        year_match = _YEAR_PAREN_RE.search(text)
         year = year_match.group(1) if year_match else None
-        text = re.sub(r'\s*\(\d{4}\)\s*', '', text).strip()
+        text = _YEAR_PAREN_RE.sub('', text).strip()
 
         # Strip surrounding quotes from title
         text = text.strip('"').strip("'").strip()
@@ -298,25 +383,27 @@ class ContentExtractor:
             return f"{text} ({year})"
         return text or None
 
-    def _parse_swedish_datetime(self, text: str) -> Optional[str]:
+    def _parse_swedish_datetime(self, text: str, now: Optional[datetime] = None) -> Optional[str]:
         """
-        Parse a Swedish date/time string like "28 maj 19.00" into "YYYY-MM-DD HH:MM".
+        Parse a date/time string like "28 maj 19.00" (or "2026-05-28 19.00")
+        into "YYYY-MM-DD HH:MM".
 
-        Assumes the current or next year when no year is present.
+        Assumes the current or next year (relative to ``now``, default the
+        current time) when no year is present.
         """
-        # Pattern: "28 maj 19.00" or "28 maj kl. 19.00" or "28 maj kl 19.00"
-        pattern = r'(\d{1,2})\s+([a-zåäö]+)(?:\s+kl\.?\s*)?(\d{1,2})[.:](\d{2})'
-        match = re.search(pattern, text.lower())
+        pattern = _DATETIME_RE if '-' in text else _SWEDISH_DATETIME_RE
+        match = pattern.search(text)
         if not match:
             return None
 
-        day, month_name, hour, minute = match.groups()
-        month = SWEDISH_MONTHS.get(month_name)
-        if not month:
-            return None
+        if match.lastgroup == 'iso':
+            return f"{match['date']} {match['h1']}:{match['m1']}"
+
+        day, hour, minute = match['day'], match['h2'], match['m2']
+        month = SWEDISH_MONTHS[match['mon'].lower()]
 
         # Pick the year: if the date has already passed this year, use next year
-        now = datetime.now()
+        now = now or datetime.now()
         year = now.year
         try:
             candidate = datetime(year, int(month), int(day))
@@ -335,13 +422,12 @@ class ContentExtractor:
         (e.g. "2025-12-19T09:06:47+01:00") compares as less-than this value,
         correctly triggering a re-check.
         """
-        pattern = r'(\d{1,2})\s+([a-zåäö]+),?\s+(\d{4})'
-        match = re.search(pattern, text.lower())
+        match = _SWEDISH_DATE_RE.search(text)
         if not match:
             return None
 
         day, month_name, year = match.groups()
-        month = SWEDISH_MONTHS.get(month_name)
+        month = SWEDISH_MONTHS.get(month_name.lower())
         if not month:
             return None
 
@@ -0,0 +1,25 @@
+"""
+Debug screenshot location shared by the consent handler and content extractor.
+"""
+
+from pathlib import Path
+from time import monotonic_ns
+
+
+# Debug screenshot directory, created on the first failure only
+SCREENSHOT_DIR = Path("debug_screenshots")
+_screenshot_dir_ready = False
+
+
+def _ensure_screenshot_dir() -> Path:
+    """Create the debug screenshot directory once per process and return it."""
+    global _screenshot_dir_ready
+    if not _screenshot_dir_ready:
+        SCREENSHOT_DIR.mkdir(exist_ok=True)
+        _screenshot_dir_ready = True
+    return SCREENSHOT_DIR
+
+
+def debug_screenshot_path(prefix: str) -> Path:
+    """Return a unique path for a new debug screenshot, e.g. consent_failure_<ns>.png."""
+    return _ensure_screenshot_dir() / f"{prefix}_{monotonic_ns()}.png"
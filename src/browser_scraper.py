@@ -10,20 +10,40 @@ db.json database format.
 
 import asyncio
 import logging
+import os
 from pathlib import Path
 from typing import Optional, Dict, Any
 from datetime import datetime
-import json
 import aiofiles
 
 from models import BrowserConfig, MovieData, ScrapingResult
-from browser_automation import BrowserAutomationEngine, CookieConsentHandler, ContentExtractor
+from browser_automation import BrowserAutomationEngine, BrowserPool, CookieConsentHandler, ContentExtractor
 from discord_notifier import DiscordNotifier
-from discord_webhook import DiscordEmbed
+from db_json import dump_db, load_db
 
 
 logger = logging.getLogger(__name__)
 
+# Location reported in error notifications, e.g. "src/browser_scraper.py"
+_ERR_LOC = "/".join(Path(__file__).resolve().parts[-2:])
+
+# db.json files below this size (bytes) are read synchronously
+SYNC_READ_LIMIT = 64 * 1024
+
+
+async def _gather_or_cancel(*aws):
+    """Like asyncio.gather(), but if one awaitable fails the others are
+    cancelled and awaited before the error propagates, so nothing keeps
+    running on a page that cleanup() is about to close."""
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
 
 class BrowserWebChecker:
     """
@@ -32,15 +52,24 @@ class BrowserWebChecker:
     Navigates to the main page once, handles the cookie consent dialog,
     then extracts all movie data (title, datetime, booking URL, detail URL)
     directly from the listing — no sub-page navigation needed.
+
+    Pass a shared BrowserPool when calling go() repeatedly so the browser is
+    launched once instead of on every check.
     """
 
-    def __init__(self, url: str, db_file_path: Path, headless: bool = True):
+    def __init__(
+        self,
+        url: str,
+        db_file_path: Path,
+        headless: bool = True,
+        pool: Optional[BrowserPool] = None,
+    ):
         self.url = url
         self.db_file_path = db_file_path
         self.notifier = DiscordNotifier()
 
         self.browser_config = BrowserConfig(headless=headless)
-        self.browser_engine = BrowserAutomationEngine(self.browser_config)
+        self.browser_engine = BrowserAutomationEngine(self.browser_config, pool=pool)
         self.consent_handler = CookieConsentHandler()
         self.content_extractor = ContentExtractor()
 
@@ -61,26 +90,33 @@ class BrowserWebChecker:
             await self.browser_engine.initialize_browser()
             await self.browser_engine.create_context()
 
-            page = await self.browser_engine.navigate_to_page(self.url)
+            page = await self.browser_engine.get_page()
 
-            # Handle cookie consent
-            consent_result = await self.consent_handler.handle_consent(page)
+            # Navigate, handle cookie consent and wait for the listing to be
+            # present concurrently; the waits pick up elements as they load
+            _, consent_result, _ = await _gather_or_cancel(
+                self.browser_engine.navigate_to_page(self.url),
+                self.consent_handler.handle_consent(page),
+                self.content_extractor.wait_for_content_load(page),
+            )
             logger.info(f"Consent handling: success={consent_result.success}, "
                         f"method={consent_result.method_used!r}")
 
-            # Wait for the listing to be present
-            await self.content_extractor.wait_for_content_load(page)
+            # A 'commit' navigation and an attached-only listing wait return
+            # before the footer is guaranteed to be parsed
+            await page.wait_for_load_state('domcontentloaded')
 
             # Compare "last changed" dates
             site_last_changed = await self.content_extractor.extract_last_changed_date(page)
-            db_last_changed = await self.get_db_last_changed_date()
+            if site_last_changed is None:
+                raise RuntimeError("'Senast ändrad' date not found on the page")
+            db = await self.open_db_file()
+            db_last_changed = db.get('last_changed_date')
 
             logger.info(f"Site last changed: {site_last_changed}")
             logger.info(f"DB last changed:   {db_last_changed}")
 
-            if db_last_changed is None or (
-                site_last_changed and site_last_changed > db_last_changed[:19]
-            ):
+            if db_last_changed is None or site_last_changed > db_last_changed[:19]:
                 logger.info("Change detected — extracting movie data...")
 
                 # Extract everything from the main page (no sub-page needed)
@@ -92,8 +128,7 @@ class BrowserWebChecker:
                     if legacy.get(field):
                         print(f"{field.replace('_', ' ').title()}: {legacy[field]}")
 
-                # Persist to db.json
-                db = await self.open_db_file()
+                # Persist to db.json (reusing the copy read above)
                 db['last_changed_date'] = site_last_changed
                 db['latest_movie_data'] = legacy
                 await self.write_db_file(db)
@@ -109,7 +144,7 @@ class BrowserWebChecker:
                         legacy['booking_url'],
                     )
                     self.notifier.send_embed(embed)
-                    logger.info("Discord notification sent")
+                    logger.info("Discord notification queued")
                 else:
                     missing = [f for f in required if not legacy.get(f)]
                     logger.warning(f"Incomplete data — skipping notification. Missing: {missing}")
@@ -117,17 +152,17 @@ class BrowserWebChecker:
                 print("Site has not changed")
 
         except Exception as e:
-            error_msg = (
-                f"An error occurred in "
-                f"{Path(__file__).parts[-2]}/{Path(__file__).name}:\n"
-                f"**{type(e).__name__}**: {e}"
-            )
+            error_msg = f"An error occurred in {_ERR_LOC}:\n**{type(e).__name__}**: {e}"
             logger.error(error_msg)
             self.notifier.send_message(error_msg)
 
         finally:
             await self.browser_engine.cleanup()
 
+    async def close(self) -> None:
+        """Send pending notifications and close the notifier's HTTP session."""
+        await self.notifier.close()
+
     # ------------------------------------------------------------------
     # Helpers
     # ------------------------------------------------------------------
@@ -154,15 +189,20 @@ class BrowserWebChecker:
     async def open_db_file(self) -> Dict[str, Any]:
         """Read db.json; return empty dict if file doesn't exist yet."""
         try:
-            async with aiofiles.open(self.db_file_path, 'r') as f:
-                return json.loads(await f.read())
+            # Small files are cheaper to read directly than through aiofiles
+            if os.path.getsize(self.db_file_path) < SYNC_READ_LIMIT:
+                with open(self.db_file_path, 'rb') as f:
+                    return load_db(f.read())
+            async with aiofiles.open(self.db_file_path, 'rb') as f:
+                return load_db(await f.read())
         except FileNotFoundError:
             return {}
 
     async def write_db_file(self, data: Dict[str, Any]) -> None:
-        """Write data to db.json."""
-        async with aiofiles.open(self.db_file_path, 'w') as f:
-            await f.write(json.dumps(data, indent=2))
+        """Write data to db.json (compact; indented when debug logging is on)."""
+        content = dump_db(data, indent=logger.isEnabledFor(logging.DEBUG))
+        async with aiofiles.open(self.db_file_path, 'wb') as f:
+            await f.write(content)
 
     def generate_embed(
         self,
@@ -171,18 +211,18 @@ class BrowserWebChecker:
         screening_location: str,
         movie_url: str,
         booking_url: str,
-    ) -> DiscordEmbed:
-        """Generate a Discord embed for the new screening."""
-        return DiscordEmbed(
-            title=f"New Screening: {movie_title}",
-            description=(
+    ) -> Dict[str, Any]:
+        """Generate the Discord embed payload for the new screening."""
+        return {
+            'title': f"New Screening: {movie_title}",
+            'description': (
                 f"**When:** {screening_datetime}\n"
                 f"**Where:** {screening_location}\n"
                 f"**Details:** [View More]({movie_url})\n"
                 f"**Book here:** [Click to Book]({booking_url})"
             ),
-            color=0x00FF00,
-        )
+            'color': 0x00FF00,
+        }
 
 
 # Backward compatibility alias
@@ -1,16 +1,92 @@
 from pathlib import Path
 import re
-import aiofiles
 import aiohttp
-from discord_webhook import DiscordEmbed
-import requests
-from bs4 import BeautifulSoup, Tag
-from dateutil import parser
+from lxml import etree, html as lxml_html
+from lxml.html import HtmlElement
 import asyncio
-import json
+import copy
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Mapping, Tuple, Union
+from urllib.parse import urljoin
 from discord_notifier import DiscordNotifier
+from db_json import dump_db, load_db
+
+# Movie title patterns: "Title" in quotes, "Throwback Thursday: Title (Year)"
+_TITLE_RE = re.compile(r'"([^"]*)"')
+_THROWBACK_TITLE_RE = re.compile(r'Throwback Thursday:\s*(.+?)\s*\(\d{4}\)')
+_TRAILING_YEAR_RE = re.compile(r'\s*\(\d{4}\)\s*$')
+
+def _read_db_sync(path) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+def _write_db_sync(path, content: bytes) -> None:
+    # The whole document goes out in a single write
+    with open(path, 'wb') as f:
+        f.write(content)
+
+class JsonFileBackend:
+    """Stores the checker's state as a JSON file (db.json)."""
+    def __init__(self, path):
+        self.path = path
+        # Raw file content as last read or written, for the dirty check
+        self._snapshot: Optional[bytes] = None
+
+    async def load(self) -> Dict[str, Any]:
+        try:
+            content = await asyncio.to_thread(_read_db_sync, self.path)
+        except FileNotFoundError:
+            return {}
+        self._snapshot = content
+        return load_db(content)
+
+    async def save(self, data: Dict[str, Any]) -> None:
+        content = dump_db(data)
+        # Dirty check: skip the write when the file already holds this data
+        if content == self._snapshot:
+            return
+        await asyncio.to_thread(_write_db_sync, self.path, content)
+        self._snapshot = content
+
+class DictBackend:
+    """Keeps the checker's state in memory, e.g. for tests."""
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        self.data: Dict[str, Any] = data if data is not None else {}
+
+    async def load(self) -> Dict[str, Any]:
+        # A copy, so callers mutating the result don't change the stored state
+        return copy.deepcopy(self.data)
+
+    async def save(self, data: Dict[str, Any]) -> None:
+        self.data = copy.deepcopy(data)
+
+# Pages are UTF-8; an explicit parser encoding lets raw response bytes be
+# parsed without decoding them first. Nothing looks elements up by id or
+# reads comments/processing instructions, so the parser skips those.
+_HTML_PARSER = lxml_html.HTMLParser(
+    encoding='utf-8', collect_ids=False, remove_comments=True, remove_pis=True
+)
+
+def _class_xpath(class_name: str) -> str:
+    # XPath 1.0 equivalent of the CSS class selector ".class_name"
+    return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+# XPath expressions used by the field helpers, compiled once at import;
+# each selects at most the one element its helper reads
+_LAST_CHANGED_TIME_XPATH = etree.XPath(f"(({_class_xpath('sv-font-uppdaterad-info-ny')})[1]//time)[1]")
+_MOVIE_LINK_XPATH = etree.XPath(f"(({_class_xpath('sv-channel-item')})[1]//a[@href])[1]")
+_MOVIE_TITLE_XPATH = etree.XPath(f"({_class_xpath('sidrubrik')})[1]")
+_BOOKING_ANCHOR_XPATH = etree.XPath("(//strong[.='Köp biljett']/ancestor::a[1])[1]")
+_SCREENING_TIME_XPATH = etree.XPath("(//strong[.='Tid:']/following-sibling::time[1][@datetime])[1]")
+_LOCATION_LABEL_XPATH = etree.XPath("(//strong[contains(., 'Plats:')])[1]")
+
+# <time datetime="..."> inside the "last updated" block, matched on raw bytes
+_LAST_CHANGED_RE = re.compile(
+    rb'sv-font-uppdaterad-info-ny.{0,500}?<time[^>]*\sdatetime="([^"]+)"', re.S
+)
+
+# Location reported in error notifications, e.g. "repo/src/checker.py"
+_ERR_LOC = "/".join(Path(__file__).resolve().parts[-3:])
 
 class WebChecker:
     """
@@ -18,119 +94,183 @@ class WebChecker:
     Attributes:
         url (str): The URL of the webpage to monitor.
         db_file_path (str): The file path to the JSON database file.
+        db_backend (JsonFileBackend | DictBackend): Storage for the checker's state; a JsonFileBackend on db_file_path by default.
     Methods:
-        download_html(url: str) -> str:
-            Downloads the HTML content of the given URL.
-        html_to_soup(html: str) -> BeautifulSoup:
-            Converts HTML content to a BeautifulSoup object.
-        get_element_by_class(class_name: str, soup: BeautifulSoup) -> Optional[Tag]:
-            Finds the first element with the specified class name in the BeautifulSoup object.
-        get_site_last_changed_date(soup: BeautifulSoup) -> Optional[str]:
-            Extracts the last changed date of the site from the BeautifulSoup object.
-        get_db_last_changed_date() -> Optional[str]:
-            Retrieves the last changed date from the JSON database file.
+        download_html(url: str, headers: Optional[Dict[str, str]] = None) -> Tuple[int, bytes, Mapping[str, str]]:
+            Downloads the HTML content of the given URL, optionally as a conditional request.
+        head_validators(url: str) -> Dict[str, str]:
+            Returns the ETag/Last-Modified validators of the given URL from a HEAD request.
+        html_to_soup(html: Union[str, bytes]) -> HtmlElement:
+            Parses HTML content into an lxml element tree.
+        get_element_by_class(class_name: str, soup: HtmlElement) -> Optional[HtmlElement]:
+            Finds the first element with the specified class name in the parsed tree.
+        get_site_last_changed_date(soup: HtmlElement) -> Optional[str]:
+            Extracts the last changed date of the site from the parsed tree.
+        get_site_last_changed_date_bytes(html: bytes) -> Optional[str]:
+            Extracts the last changed date from the raw HTML bytes without parsing.
         datestring_to_datetime(datestring: str) -> datetime:
             Converts a date string to a datetime object.
         open_db_file() -> Dict[str, Any]:
             Opens and reads the JSON database file.
         write_db_file(data: Dict[str, Any]) -> None:
-            Writes data to the JSON database file.
-        get_movie_url(soup: BeautifulSoup) -> Optional[str]:
-            Extracts the movie URL from the BeautifulSoup object.
-        get_movie_title(soup: BeautifulSoup) -> Optional[str]:
-            Extracts the movie title from the BeautifulSoup object.
-        get_booking_url(soup: BeautifulSoup) -> Optional[str]:
-            Extracts the booking URL from the BeautifulSoup object.
-        get_screening_datetime(soup: BeautifulSoup) -> Optional[datetime]:
-            Extracts the screening datetime from the BeautifulSoup object.
-        get_screening_location(soup: BeautifulSoup) -> Optional[str]:
-            Extracts the screening location from the BeautifulSoup object.
+            Writes data to the JSON database file unless it already holds that data.
+        get_movie_url(soup: HtmlElement) -> Optional[str]:
+            Extracts the movie URL from the parsed tree.
+        get_movie_title(soup: HtmlElement) -> Optional[str]:
+            Extracts the movie title from the parsed tree.
+        get_booking_url(soup: HtmlElement) -> Optional[str]:
+            Extracts the booking URL from the parsed tree.
+        get_screening_datetime(soup: HtmlElement) -> Optional[str]:
+            Extracts the screening datetime ("YYYY-MM-DD HH:MM") from the parsed tree.
+        get_screening_location(soup: HtmlElement) -> Optional[str]:
+            Extracts the screening location from the parsed tree.
+        extract_all(html: Union[str, bytes, HtmlElement]) -> Dict[str, Optional[str]]:
+            Extracts every field above from a single parse of the page.
         go() -> None:
             Main method to check for updates, extract movie information, and update the database.
+        close() -> None:
+            Closes the HTTP sessions used by this checker and its notifier.
     """
-    def __init__(self, url: str, db_file_path: Path):
+    def __init__(
+        self,
+        url: str,
+        db_file_path: Path,
+        session: Optional[aiohttp.ClientSession] = None,
+        db_backend: Optional[Union[JsonFileBackend, DictBackend]] = None,
+    ):
         self.url: str = url
         self.db_file_path: str = db_file_path
         self.notifier = DiscordNotifier()
+        # Reuse one WebChecker per process so polls share the pooled
+        # connection; an injected session is left for its owner to close
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session: bool = session is None
+        self.db_backend = db_backend if db_backend is not None else JsonFileBackend(db_file_path)
 
-    # def download_html(self, url: str) -> str:
-    #     response = requests.get(url)
-    #     response.raise_for_status()
-    #     return response.text
-    
-    async def download_html(self, url: str) -> str:
+    def _get_session(self) -> aiohttp.ClientSession:
+        # One pooled keep-alive session for every request this checker makes
+        if self._session is None or (self._owns_session and self._session.closed):
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=10, keepalive_timeout=75),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the shared HTTP session; flush and close the notifier."""
+        if self._session is not None and self._owns_session:
+            await self._session.close()
+            self._session = None
+        await self.notifier.close()
+
+    async def download_html(
+        self, url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Tuple[int, bytes, Mapping[str, str]]:
         """Download HTML content with an explicit timeout and improved error handling.
 
-        Uses aiohttp with a ClientTimeout so the coroutine fails fast when the
-        remote host is unreachable. Raises ConnectionError on network errors
+        Uses the checker's shared aiohttp session (keep-alive, 10s total
+        timeout) so the coroutine fails fast when the remote host is
+        unreachable. Raises ConnectionError on network errors
         or timeouts so callers can handle/report them clearly.
+
+        Returns (status, body, headers) with the raw body bytes, which are
+        parsed as UTF-8. A 304 Not Modified answer to a conditional request
+        is returned with an empty body instead of raising.
         """
-        timeout = aiohttp.ClientTimeout(total=10)
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:
-                    response.raise_for_status()
-                    return await response.text()
+            async with self._get_session().get(url, headers=headers) as response:
+                if response.status == 304:
+                    return response.status, b'', response.headers
+                response.raise_for_status()
+                return response.status, await response.read(), response.headers
         except asyncio.TimeoutError:
             raise ConnectionError(f"Timeout while connecting to {url}")
         except aiohttp.ClientError as e:
             raise ConnectionError(f"Network error while requesting {url}: {e}")
 
-    def html_to_soup(self, html: str) -> BeautifulSoup:
-        return BeautifulSoup(html, 'lxml')
+    async def head_validators(self, url: str) -> Dict[str, str]:
+        """Return the ETag/Last-Modified validators from a HEAD request.
+
+        Best effort: returns an empty dict if the server refuses HEAD or the
+        request fails, so callers fall through to a (conditional) GET.
+        """
+        try:
+            async with self._get_session().head(url) as response:
+                if response.status != 200:
+                    return {}
+                return self.get_validators(response.headers)
+        except (asyncio.TimeoutError, aiohttp.ClientError):
+            return {}
+
+    def get_validators(self, headers: Mapping[str, str]) -> Dict[str, str]:
+        validators = {}
+        if headers.get('ETag'):
+            validators['etag'] = headers['ETag']
+        if headers.get('Last-Modified'):
+            validators['last_modified'] = headers['Last-Modified']
+        return validators
+
+    def get_conditional_headers(self, http_cache: Dict[str, str]) -> Dict[str, str]:
+        headers = {}
+        if http_cache.get('etag'):
+            headers['If-None-Match'] = http_cache['etag']
+        if http_cache.get('last_modified'):
+            headers['If-Modified-Since'] = http_cache['last_modified']
+        return headers
 
-    def get_element_by_class(self, class_name: str, soup: BeautifulSoup) -> Optional[Tag]:
-        return soup.find(class_=class_name)
+    def html_to_soup(self, html: Union[str, bytes]) -> HtmlElement:
+        return lxml_html.fromstring(html, parser=_HTML_PARSER)
 
-    def get_site_last_changed_date(self, soup: BeautifulSoup) -> Optional[str]:
-        last_changed_element = self.get_element_by_class('sv-font-uppdaterad-info-ny', soup)
-        if last_changed_element:
-            time_element = last_changed_element.find('time')
-            if time_element and 'datetime' in time_element.attrs:
-                return time_element['datetime']
+    def get_element_by_class(self, class_name: str, soup: HtmlElement) -> Optional[HtmlElement]:
+        elements = soup.find_class(class_name)
+        return elements[0] if elements else None
+
+    def get_site_last_changed_date(self, soup: HtmlElement) -> Optional[str]:
+        time_elements = _LAST_CHANGED_TIME_XPATH(soup)
+        if time_elements:
+            return time_elements[0].get('datetime')
         return None
 
-    async def get_db_last_changed_date(self) -> Optional[str]:
-        json_data = await self.open_db_file()
-        return json_data.get('last_changed_date')
+    def get_site_last_changed_date_bytes(self, html: bytes) -> Optional[str]:
+        # Cheap pre-parse check on the raw body; None means "parse to be sure"
+        match = _LAST_CHANGED_RE.search(html)
+        return match.group(1).decode('ascii') if match else None
 
     def datestring_to_datetime(self, datestring: str) -> datetime:
+        # The site's timestamps are ISO 8601, which fromisoformat parses in C
+        try:
+            return datetime.fromisoformat(datestring.replace('Z', '+00:00'))
+        except ValueError:
+            pass
+        # Imported here: only non-ISO strings need dateutil
+        from dateutil import parser
         return parser.parse(datestring)
 
     async def open_db_file(self) -> Dict[str, Any]:
-        try:
-            async with aiofiles.open(self.db_file_path, 'r') as file:
-                content = await file.read()
-                return json.loads(content)
-        except FileNotFoundError:
-            return {}
+        return await self.db_backend.load()
 
     async def write_db_file(self, data: Dict[str, Any]) -> None:
-        json_data = json.dumps(data)
-        async with aiofiles.open(self.db_file_path, 'w') as f:
-            await f.write(json_data)
-
-    def get_movie_url(self, soup: BeautifulSoup) -> Optional[str]:
-        movie_element = self.get_element_by_class('sv-channel-item', soup)
-        if movie_element:
-            link_element = movie_element.find('a', href=True)
-            if link_element:
-                return requests.compat.urljoin(self.url, link_element['href'])
+        await self.db_backend.save(data)
+
+    def get_movie_url(self, soup: HtmlElement) -> Optional[str]:
+        link_elements = _MOVIE_LINK_XPATH(soup)
+        if link_elements:
+            return urljoin(self.url, link_elements[0].get('href'))
         return None
 
-    def get_movie_title(self, soup: BeautifulSoup) -> Optional[str]:
-        movie_title_element = self.get_element_by_class('sidrubrik', soup)
-        if movie_title_element:
-            movie_title_text = movie_title_element.get_text(strip=True)
+    def get_movie_title(self, soup: HtmlElement) -> Optional[str]:
+        title_elements = _MOVIE_TITLE_XPATH(soup)
+        if title_elements:
+            movie_title_text = title_elements[0].text_content().strip()
             
             # First try to find title in quotes (original format)
-            match = re.search(r'"(.*?)"', movie_title_text)
+            match = _TITLE_RE.search(movie_title_text)
             if match:
                 return match.group(1)
             
             # New format: "Throwback Thursday: Title (Year)"
             # Extract everything between "Throwback Thursday: " and " (year)"
-            throwback_match = re.search(r'Throwback Thursday:\s*(.+?)\s*\(\d{4}\)', movie_title_text)
+            throwback_match = _THROWBACK_TITLE_RE.search(movie_title_text)
             if throwback_match:
                 return throwback_match.group(1).strip()
             
@@ -140,75 +280,149 @@ class WebChecker:
                 if len(parts) > 1:
                     title = parts[1].strip()
                     # Remove year in parentheses if present
-                    title = re.sub(r'\s*\(\d{4}\)\s*$', '', title)
+                    title = _TRAILING_YEAR_RE.sub('', title)
                     return title.strip()
         
         return None
 
-    def get_booking_url(self, soup: BeautifulSoup) -> Optional[str]:
-        booking_element = soup.find('strong', string='Köp biljett')
-        if booking_element:
-            anchor = booking_element.find_parent('a')
-            if anchor and 'href' in anchor.attrs:
-                return anchor['href']
+    def get_booking_url(self, soup: HtmlElement) -> Optional[str]:
+        anchors = _BOOKING_ANCHOR_XPATH(soup)
+        if anchors:
+            return anchors[0].get('href')
         return None
 
-    def get_screening_datetime(self, soup: BeautifulSoup) -> Optional[datetime]:
-        time_element = soup.find('strong', string='Tid:')
-        if time_element:
-            time_tag = time_element.find_next_sibling('time')
-            if time_tag and 'datetime' in time_tag.attrs:
-                dt = datetime.fromisoformat(time_tag['datetime'])
-                return dt.strftime('%Y-%m-%d %H:%M')
+    def get_screening_datetime(self, soup: HtmlElement) -> Optional[str]:
+        time_tags = _SCREENING_TIME_XPATH(soup)
+        if time_tags:
+            return self._format_screening_datetime(time_tags[0].get('datetime'))
         return None
+
+    def _format_screening_datetime(self, value: str) -> str:
+        # "2025-02-20T19:00:00+01:00" -> "2025-02-20 19:00"; the attribute is
+        # already ISO 8601, so slicing gives the same result as parsing
+        return value.replace('T', ' ', 1)[:16]
     
-    def get_screening_location(self, soup: BeautifulSoup) -> Optional[str]:
-        location_element = soup.find('strong', string=lambda t: t and 'Plats:' in t)
-        if location_element:
-            location_text = location_element.next_sibling
+    def get_screening_location(self, soup: HtmlElement) -> Optional[str]:
+        location_elements = _LOCATION_LABEL_XPATH(soup)
+        if location_elements:
+            location_text = location_elements[0].tail
             if location_text:
                 return location_text.strip()
         return None
 
-    def generate_embed(self, movie_title: str, screening_datetime: str, screening_location: str, movie_url: str, booking_url: str) -> DiscordEmbed:
-        return DiscordEmbed(
-            title=f"New Screening: {movie_title}",
-            description=(
+    def _extract_movie_fields(self, soup: HtmlElement) -> Dict[str, Optional[str]]:
+        """Extract title, screening time, location and booking URL in one pass.
+
+        Walks the <strong> labels once and dispatches on their text instead of
+        searching the tree separately for each field.
+        """
+        fields: Dict[str, Optional[str]] = {
+            'title': self.get_movie_title(soup),
+            'screening_datetime': None,
+            'location': None,
+            'booking_url': None,
+        }
+        for strong in soup.iter('strong'):
+            label = strong.text_content()
+            if label == 'Tid:':
+                if fields['screening_datetime'] is None:
+                    time_tag = next(strong.itersiblings('time'), None)
+                    if time_tag is not None and time_tag.get('datetime'):
+                        fields['screening_datetime'] = self._format_screening_datetime(time_tag.get('datetime'))
+            elif label == 'Köp biljett':
+                if fields['booking_url'] is None:
+                    anchor = next(strong.iterancestors('a'), None)
+                    if anchor is not None:
+                        fields['booking_url'] = anchor.get('href')
+            elif 'Plats:' in label:
+                if fields['location'] is None and strong.tail:
+                    fields['location'] = strong.tail.strip()
+        return fields
+
+    def extract_all(self, html: Union[str, bytes, HtmlElement]) -> Dict[str, Optional[str]]:
+        """Parse the page once and run every field helper on the shared tree.
+
+        Accepts raw HTML or an already parsed tree.
+        """
+        soup = html if isinstance(html, HtmlElement) else self.html_to_soup(html)
+        return {
+            'last_changed_date': self.get_site_last_changed_date(soup),
+            'movie_url': self.get_movie_url(soup),
+            **self._extract_movie_fields(soup),
+        }
+
+    def generate_embed(self, movie_title: str, screening_datetime: str, screening_location: str, movie_url: str, booking_url: str) -> Dict[str, Any]:
+        return {
+            'title': f"New Screening: {movie_title}",
+            'description': (
                 f"**When:** {screening_datetime}\n"
                 f"**Where:** {screening_location}\n"
                 f"**Details:** [View More]({movie_url})\n"
                 f"**Book here:** [Click to Book]({booking_url})"
             ),
-            color=0x00FF00  # Optional: Set an embed color (hex code)
-        )
+            'color': 0x00FF00  # Optional: Set an embed color (hex code)
+        }
                 
     async def go(self) -> None:
         try:
-            html = await self.download_html(self.url)
-            soup = self.html_to_soup(html)
-            site_last_changed_date = self.get_site_last_changed_date(soup)
-            db_last_changed_date = await self.get_db_last_changed_date()
+            # Ask the server first: a matching HEAD or a 304 to the
+            # conditional GET means the page (and its timestamp) is unchanged
+            json_data = await self.open_db_file()
+            http_cache = json_data.get('http_cache', {})
+            cached_movie_url = (json_data.get('latest_movie_data') or {}).get('movie_url')
+            if http_cache:
+                validators = await self.head_validators(self.url)
+                if validators and all(http_cache.get(k) == v for k, v in validators.items()):
+                    print("Site has not changed")
+                    return
 
-            if db_last_changed_date is None or site_last_changed_date > db_last_changed_date:
-                movie_url = self.get_movie_url(soup)
-                movie_html = await self.download_html(movie_url)
-                movie_soup = self.html_to_soup(movie_html)
+            status, html, headers = await self.download_html(
+                self.url, self.get_conditional_headers(http_cache)
+            )
+            if status == 304:
+                print("Site has not changed")
+                return
+
+            site_last_changed_date = self.get_site_last_changed_date_bytes(html)
+            db_last_changed_date = json_data.get('last_changed_date')
 
-                movie_title = self.get_movie_title(movie_soup)
-                if movie_title:
-                    print(f"Movie title: {movie_title}")
+            # Only build the tree when the raw-bytes scan can't find the
+            # timestamp or the site actually changed
+            soup = None
+            if site_last_changed_date is None:
+                soup = self.html_to_soup(html)
+                site_last_changed_date = self.get_site_last_changed_date(soup)
+            new_http_cache = self.get_validators(headers)
 
-                screening_datetime = self.get_screening_datetime(movie_soup)
-                if screening_datetime:
-                    print(f"Screening time: {screening_datetime}")
+            if db_last_changed_date is None or site_last_changed_date > db_last_changed_date:
+                if soup is None:
+                    soup = self.html_to_soup(html)
+                movie_url = self.get_movie_url(soup)
+                if movie_url is not None and movie_url == cached_movie_url:
+                    # Some other edit on the index: the listed movie is the
+                    # one already stored and announced
+                    print("Movie page has not changed")
+                    json_data['last_changed_date'] = site_last_changed_date
+                    json_data['http_cache'] = new_http_cache
+                    await self.write_db_file(json_data)
+                    return
 
-                screening_location = self.get_screening_location(movie_soup)
-                if screening_location:
-                    print(f"Location: {screening_location}")
+                _, movie_html, _ = await self.download_html(movie_url)
+                movie_soup = self.html_to_soup(movie_html)
+                fields = self._extract_movie_fields(movie_soup)
+                movie_title = fields['title']
+                screening_datetime = fields['screening_datetime']
+                screening_location = fields['location']
+                booking_url = fields['booking_url']
 
-                booking_url = self.get_booking_url(movie_soup)
-                if booking_url:
-                    print(f"Booking URL: {booking_url}")
+                for label, value in (
+                    ("Movie title", movie_title),
+                    ("Screening time", screening_datetime),
+                    ("Location", screening_location),
+                    ("Booking URL", booking_url),
+                ):
+                    if value:
+                        print(f"{label}: {value}")
 
                 latest_movie_data = {
                     'title': movie_title,
@@ -218,9 +432,9 @@ class WebChecker:
                     'movie_url': movie_url
                 }      
         
-                json_data = await self.open_db_file()
                 json_data['last_changed_date'] = site_last_changed_date
                 json_data['latest_movie_data'] = latest_movie_data
+                json_data['http_cache'] = new_http_cache
                 await self.write_db_file(json_data)
                         
                 embed = self.generate_embed(movie_title, screening_datetime, screening_location, movie_url, booking_url)
@@ -228,6 +442,10 @@ class WebChecker:
 
             else:
                 print("Site has not changed")
+                if new_http_cache != http_cache:
+                    # Remember the validators so the next check can be conditional
+                    json_data['http_cache'] = new_http_cache
+                    await self.write_db_file(json_data)
         except Exception as e:
-            error_msg = f"An error occurred in {Path(__file__).parts[-3]}/{Path(__file__).parts[-2]}/{Path(__file__).name}:\n**{type(e).__name__}**: {e}"
+            error_msg = f"An error occurred in {_ERR_LOC}:\n**{type(e).__name__}**: {e}"
             self.notifier.send_message(error_msg)
@@ -0,0 +1,31 @@
+"""
+JSON (de)serialization of db.json, shared by both checkers.
+
+Uses orjson when it is installed and the stdlib json module otherwise;
+either way the document is handled as UTF-8 bytes.
+"""
+
+import json
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib json module
+    orjson = None
+
+
+def load_db(content: bytes) -> Dict[str, Any]:
+    # orjson parses the UTF-8 bytes directly, without a decode step
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def dump_db(data: Dict[str, Any], indent: bool = False) -> bytes:
+    """Serialize compactly, or indented by two spaces with indent=True."""
+    # orjson produces UTF-8 bytes directly, skipping the str encode step
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(data, indent=2).encode('utf-8')
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
@@ -1,32 +1,93 @@
-from discord_webhook import DiscordEmbed, DiscordWebhook
+import asyncio
+import functools
 import os
+from typing import Any, Dict, Optional, Set, Tuple
+
+import aiohttp
 from dotenv import load_dotenv
+from yarl import URL
+
+@functools.cache
+def get_webhook_url() -> Optional[str]:
+    """Return DISCORD_WEBHOOK_URL, loading .env and reading it only once."""
+    load_dotenv()
+    return os.getenv('DISCORD_WEBHOOK_URL')
 
 class DiscordNotifier:
     """
     A class to send notifications to a Discord channel using a webhook.
+
+    Sends are fire-and-forget: they are posted in background tasks so the
+    caller doesn't wait on Discord. Call flush() (or close()) before the
+    event loop ends to make sure they went out.
     Methods
     -------
     __init__():
-        Initializes the DiscordNotifier with the webhook URL from environment variables.
-    send_message(message: str) -> None:
-        Sends a message to the Discord channel using the webhook URL.
+        Initializes the DiscordNotifier with the webhook URL from environment variables (read once per process).
+    send_message(message: str) -> asyncio.Task:
+        Queues a message to the Discord channel using the webhook URL.
+    send_embed(embed: Dict[str, Any]) -> asyncio.Task:
+        Queues an embed to the Discord channel using the webhook URL.
+    flush() -> None:
+        Waits until every queued notification has been sent (failures are printed as they happen).
+    close() -> None:
+        Flushes pending notifications and closes the HTTP session.
     """
     def __init__(self):
-        load_dotenv()
-        self.webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
+        self.webhook_url = get_webhook_url()
+        # Parsed once here rather than by aiohttp on every post
+        self._webhook_url: Optional[URL] = URL(self.webhook_url) if self.webhook_url else None
+        # Created on first use (inside the running loop) and kept for the
+        # notifier's lifetime so repeated notifications reuse the connection
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Sends still in flight; holding references keeps the tasks alive
+        self._pending: Set[asyncio.Task] = set()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+        return self._session
+
+    async def _post(self, payload: Dict[str, Any]) -> Tuple[int, str]:
+        # A Discord webhook is a plain JSON POST
+        async with self._get_session().post(self._webhook_url, json=payload) as response:
+            return response.status, await response.text()
+
+    async def _deliver(self, coro) -> None:
+        # Report failures inside the task: a send may finish (and leave
+        # _pending) long before anyone calls flush()
+        try:
+            await coro
+        except Exception as e:
+            print(f"Failed to send message. {type(e).__name__}: {e}")
+
+    def _schedule(self, coro) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._deliver(coro))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+        return task
         
-    def send_message(self, message: str) -> None:
-        webhook = DiscordWebhook(url=self.webhook_url, content=message)
-        webhook.execute()
+    def send_message(self, message: str) -> asyncio.Task:
+        return self._schedule(self._post({'content': message}))
         
         
-    def send_embed(self, embed: DiscordEmbed) -> None:
-        webhook = DiscordWebhook(url=self.webhook_url)
-        webhook.add_embed(embed)
-        response = webhook.execute()
+    def send_embed(self, embed: Dict[str, Any]) -> asyncio.Task:
+        return self._schedule(self._send_embed(embed))
+
+    async def _send_embed(self, embed: Dict[str, Any]) -> None:
+        status, text = await self._post({'embeds': [embed]})
 
-        if response.status_code == 200:
+        if status in (200, 204):
             print("Message sent successfully!")
         else:
-            print(f"Failed to send message. Status code: {response.status_code}, Response: {response.text}")
+            print(f"Failed to send message. Status code: {status}, Response: {text}")
+
+    async def flush(self) -> None:
+        while self._pending:
+            await asyncio.gather(*self._pending)
+
+    async def close(self) -> None:
+        await self.flush()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -9,7 +9,15 @@ async def main():
     
     # Use the new browser-based scraper
     web_checker = BrowserWebChecker(url=url, db_file_path=db_file_path, headless=True)
-    await web_checker.go()
+    try:
+        await web_checker.go()
+    finally:
+        await web_checker.close()
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    try:
+        import uvloop
+    except ImportError:  # not available on Windows; keep the default loop
+        asyncio.run(main())
+    else:
+        uvloop.run(main())
\ No newline at end of file
@@ -7,10 +7,36 @@ new structures needed for browser automation and consent handling.
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Sequence
 
 
-@dataclass
+# Default CSS selectors for ExtractionConfig
+_TITLE_SELECTORS = (
+    'h1',  # Main heading
+    '.sidrubrik',
+    '[class*="title"]',
+    '[class*="heading"]'
+)
+_DATETIME_SELECTORS = (
+    'time[datetime]',
+    'strong:has-text("Tid:") + *',  # Text after "Tid:"
+    '[class*="time"]',
+    '[class*="date"]'
+)
+_LOCATION_SELECTORS = (
+    'strong:has-text("Plats:") + *',  # Text after "Plats:"
+    '[class*="location"]',
+    '[class*="venue"]'
+)
+_BOOKING_URL_SELECTORS = (
+    'a:contains("Köp biljett")',
+    'a:contains("Book")',
+    '[class*="booking"]',
+    '[href*="bio.se"]'
+)
+
+
+@dataclass(slots=True)
 class MovieData:
     """
     Movie information extracted from the webpage.
@@ -27,7 +53,7 @@ class MovieData:
     source_url: Optional[str] = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ConsentResult:
     """
     Result of cookie consent dialog handling.
@@ -36,6 +62,9 @@ class ConsentResult:
     debugging information for troubleshooting.
     """
     success: bool
+    # How consent was handled: the CSS selector of the clicked button,
+    # "label:<button label>" when it was matched by its accessible name,
+    # or "no_dialog_detected"
     method_used: Optional[str] = None
     error_message: Optional[str] = None
     screenshot_path: Optional[str] = None
@@ -43,7 +72,7 @@ class ConsentResult:
     timeout_occurred: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class ScrapingResult:
     """
     Complete result of a scraping operation.
@@ -67,7 +96,7 @@ class ScrapingResult:
             self.browser_errors = []
 
 
-@dataclass
+@dataclass(slots=True)
 class BrowserConfig:
     """
     Configuration for browser automation engine.
@@ -84,9 +113,11 @@ class BrowserConfig:
     block_images: bool = True  # For performance
     block_fonts: bool = True   # For performance
     enable_javascript: bool = True
+    max_contexts: int = 4  # Concurrent contexts when using a BrowserPool
+    preconnect_origins: Optional[List[str]] = None  # Origins to preconnect to on every page
     
     
-@dataclass
+@dataclass(slots=True)
 class ExtractionConfig:
     """
     Configuration for content extraction.
@@ -95,10 +126,13 @@ class ExtractionConfig:
     page elements and fallback behavior.
     """
     # CSS selectors for movie information
-    title_selectors: List[str] = None
-    datetime_selectors: List[str] = None
-    location_selectors: List[str] = None
-    booking_url_selectors: List[str] = None
+    title_selectors: Sequence[str] = None
+    datetime_selectors: Sequence[str] = None
+    location_selectors: Sequence[str] = None
+    booking_url_selectors: Sequence[str] = None
+    
+    # Element whose presence marks the page content as ready
+    ready_selector: str = 'main li:has(time)'
     
     # Extraction timeouts and retries
     max_extraction_retries: int = 3
@@ -106,30 +140,12 @@ class ExtractionConfig:
     screenshot_on_failure: bool = True
     
     def __post_init__(self):
+        # The defaults are shared module-level tuples, not per-instance lists
         if self.title_selectors is None:
-            self.title_selectors = [
-                'h1',  # Main heading
-                '.sidrubrik',
-                '[class*="title"]',
-                '[class*="heading"]'
-            ]
+            self.title_selectors = _TITLE_SELECTORS
         if self.datetime_selectors is None:
-            self.datetime_selectors = [
-                'time[datetime]',
-                'strong:has-text("Tid:") + *',  # Text after "Tid:"
-                '[class*="time"]',
-                '[class*="date"]'
-            ]
+            self.datetime_selectors = _DATETIME_SELECTORS
         if self.location_selectors is None:
-            self.location_selectors = [
-                'strong:has-text("Plats:") + *',  # Text after "Plats:"
-                '[class*="location"]',
-                '[class*="venue"]'
-            ]
+            self.location_selectors = _LOCATION_SELECTORS
         if self.booking_url_selectors is None:
-            self.booking_url_selectors = [
-                'a:contains("Köp biljett")',
-                'a:contains("Book")',
-                '[class*="booking"]',
-                '[href*="bio.se"]'
-            ]
\ No newline at end of file
+            self.booking_url_selectors = _BOOKING_URL_SELECTORS
@@ -10,8 +10,13 @@ import asyncio
 from unittest.mock import Mock, AsyncMock, patch
 from hypothesis import given, strategies as st
 
-from src.models import BrowserConfig, ConsentResult, MovieData, ScrapingResult
-from src.browser_automation.browser_engine import BrowserAutomationEngine
+from src.models import BrowserConfig, ConsentResult, ExtractionConfig, MovieData, ScrapingResult
+from src.browser_automation.browser_engine import (
+    BrowserAutomationEngine, BrowserPool, FONT_URL_PATTERN, IMAGE_URL_PATTERN
+)
+from src.browser_automation.consent_handler import CookieConsentHandler
+from src.browser_automation.content_extractor import ContentExtractor
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
 
 class TestBrowserAutomationEngine:
@@ -57,6 +62,50 @@ class TestBrowserAutomationEngine:
         await browser_engine.cleanup()
         assert not browser_engine.is_initialized
     
+    @pytest.mark.asyncio
+    async def test_resource_blocking_routes_only_blocked_types(self):
+        """Test only image/font URL patterns are routed to Python."""
+        engine = BrowserAutomationEngine(BrowserConfig(block_images=True, block_fonts=False))
+        context = AsyncMock()
+        
+        await engine._setup_resource_blocking(context)
+        
+        context.route.assert_awaited_once()
+        pattern = context.route.call_args.args[0]
+        assert pattern is IMAGE_URL_PATTERN
+        assert pattern.search("https://example.com/poster.JPG?w=300")
+        assert not pattern.search("https://example.com/app.js")
+        assert FONT_URL_PATTERN.search("https://example.com/font.woff2")
+    
+    @pytest.mark.asyncio
+    async def test_context_injects_preconnect_hints(self):
+        """Test configured origins are injected as preconnect hints."""
+        engine = BrowserAutomationEngine(BrowserConfig(
+            block_images=False,
+            block_fonts=False,
+            preconnect_origins=['https://bio.se']
+        ))
+        browser = AsyncMock()
+        
+        context = await engine._new_context(browser)
+        
+        script = context.add_init_script.call_args.args[0]
+        assert '["https://bio.se"]' in script
+        assert 'preconnect' in script
+    
+    @pytest.mark.asyncio
+    async def test_navigation_reuses_page(self, browser_engine):
+        """Test sequential navigations share one page."""
+        page = Mock(goto=AsyncMock(return_value=Mock(status=200)), is_closed=Mock(return_value=False))
+        browser_engine.context = Mock(new_page=AsyncMock(return_value=page))
+        
+        first = await browser_engine.navigate_to_page("https://example.com/a")
+        second = await browser_engine.navigate_to_page("https://example.com/b")
+        
+        assert first is second is page
+        browser_engine.context.new_page.assert_awaited_once()
+        assert page.goto.await_count == 2
+    
     def test_performance_metrics_structure(self, browser_engine):
         """Test performance metrics return expected structure."""
         metrics = browser_engine.get_performance_metrics()
@@ -69,6 +118,232 @@ class TestBrowserAutomationEngine:
         assert 'timeouts' in metrics['config']
 
 
+class TestBrowserPool:
+    """Test cases for BrowserPool."""
+    
+    @pytest.fixture
+    def browser(self):
+        """Provide a mock browser already launched by the pool."""
+        browser = AsyncMock()
+        browser.new_context.side_effect = lambda **kwargs: Mock(
+            clear_cookies=AsyncMock(), close=AsyncMock(), route=AsyncMock(), pages=[]
+        )
+        return browser
+    
+    @pytest.fixture
+    def pool(self, browser):
+        """Provide a pool that does not launch a real browser."""
+        pool = BrowserPool(BrowserConfig(max_contexts=2))
+        pool.browser = browser
+        return pool
+    
+    @pytest.mark.asyncio
+    async def test_released_context_is_reused(self, pool, browser):
+        """Test a released context is handed out again instead of recreated."""
+        engine = BrowserAutomationEngine(BrowserConfig(), pool=pool)
+        
+        first = await pool.acquire(engine._new_context)
+        await pool.release(first)
+        second = await pool.acquire(engine._new_context)
+        
+        assert second is first
+        first.clear_cookies.assert_awaited_once()
+        assert browser.new_context.call_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_acquire_waits_at_capacity(self, pool):
+        """Test acquire blocks once max_contexts are checked out."""
+        engine = BrowserAutomationEngine(BrowserConfig(), pool=pool)
+        first = await pool.acquire(engine._new_context)
+        await pool.acquire(engine._new_context)
+        
+        waiter = asyncio.ensure_future(pool.acquire(engine._new_context))
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        
+        await pool.release(first)
+        assert await waiter is first
+    
+    @pytest.mark.asyncio
+    async def test_engine_cleanup_keeps_pooled_browser(self, pool, browser):
+        """Test engine cleanup returns its context without closing the browser."""
+        async with BrowserAutomationEngine(BrowserConfig(), pool=pool) as engine:
+            assert engine.browser is browser
+            assert engine.context is not None
+        
+        assert not engine.is_initialized
+        assert engine.context is None
+        browser.close.assert_not_called()
+        assert pool.browser is browser
+
+
+class TestCookieConsentHandler:
+    """Test cases for CookieConsentHandler."""
+    
+    @pytest.fixture
+    def consent_handler(self):
+        """Provide consent handler instance."""
+        return CookieConsentHandler(screenshot_on_failure=False)
+    
+    @pytest.mark.asyncio
+    async def test_detect_consent_dialog_single_probe(self, consent_handler):
+        """Test all dialog selectors are probed in one page call."""
+        handle = AsyncMock()
+        handle.json_value.return_value = '[role="dialog"]'
+        page = AsyncMock()
+        page.wait_for_function.return_value = handle
+        
+        assert await consent_handler.detect_consent_dialog(page) is True
+        page.wait_for_function.assert_awaited_once()
+        page.wait_for_selector.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_detect_consent_dialog_timeout(self, consent_handler):
+        """Test a probe timeout means no dialog is present."""
+        page = AsyncMock()
+        page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+        
+        assert await consent_handler.detect_consent_dialog(page) is False
+    
+    @pytest.mark.asyncio
+    async def test_handle_consent_clicks_in_one_page_call(self, consent_handler):
+        """Test the consent button is found and clicked by one in-page call."""
+        handle = AsyncMock()
+        handle.json_value.return_value = '#onetrust-accept-btn-handler'
+        page = AsyncMock()
+        page.wait_for_function.return_value = handle
+        page.locator = Mock(return_value=Mock(first=AsyncMock()))
+        
+        result = await consent_handler.handle_consent(page)
+        
+        assert result.success is True
+        assert result.dialog_detected is True
+        assert result.method_used == '#onetrust-accept-btn-handler'
+        kernel_arg = page.wait_for_function.call_args_list[0].kwargs['arg']
+        assert kernel_arg['selectors'] == consent_handler.CONSENT_SELECTORS
+        assert kernel_arg['fallbacks'] == consent_handler.FALLBACK_SELECTORS
+        page.locator.assert_called_once_with(consent_handler.JOINED_DIALOG)
+        assert page.wait_for_function.await_count == 2  # click + completion wait
+    
+    @pytest.mark.asyncio
+    async def test_handle_consent_without_dialog(self, consent_handler):
+        """Test no clickable consent button is reported as no dialog."""
+        page = AsyncMock()
+        page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+        
+        result = await consent_handler.handle_consent(page)
+        
+        assert result.success is True
+        assert result.dialog_detected is False
+        assert result.method_used == "no_dialog_detected"
+
+
+class TestContentExtractor:
+    """Test cases for ContentExtractor."""
+    
+    @pytest.fixture
+    def content_extractor(self):
+        """Provide content extractor instance."""
+        return ContentExtractor()
+    
+    @pytest.mark.asyncio
+    async def test_extract_movie_data_reads_listing_once(self, content_extractor):
+        """Test the time and links of the listing <li> come from a single page call."""
+        page = AsyncMock()
+        page.url = "https://www.boras.se/throwbackthursday.html"
+        page.evaluate.return_value = {
+            'time': [None, "28 maj 19.00"],
+            'links': [
+                ["/throwbackthursday/stand-by-me.html", 'Throwback Thursday: "Stand by Me" (1986)'],
+                ["https://bio.se/boka/123", "Köp biljett"],
+            ],
+        }
+        
+        movie = await content_extractor.extract_movie_data(page)
+        
+        assert movie.title == "Stand by Me (1986)"
+        assert movie.movie_url == "https://www.boras.se/throwbackthursday/stand-by-me.html"
+        assert movie.booking_url == "https://bio.se/boka/123"
+        assert movie.screening_datetime.endswith("-05-28 19:00")
+        page.evaluate.assert_awaited_once()
+        page.query_selector.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_extract_movie_data_without_listing(self):
+        """Test a page without a listing item yields empty movie data."""
+        content_extractor = ContentExtractor(ExtractionConfig(screenshot_on_failure=False))
+        page = AsyncMock()
+        page.url = "https://www.boras.se/throwbackthursday.html"
+        page.evaluate.return_value = None
+        
+        movie = await content_extractor.extract_movie_data(page)
+        
+        assert movie.title is None
+        assert movie.screening_datetime is None
+        assert movie.source_url == page.url
+    
+    @pytest.mark.asyncio
+    async def test_extract_movie_data_when_evaluate_fails(self):
+        """Test an evaluate error yields partial movie data and a screenshot."""
+        content_extractor = ContentExtractor()
+        page = AsyncMock()
+        page.url = "https://www.boras.se/throwbackthursday.html"
+        page.evaluate.side_effect = Exception("Target page, context or browser has been closed")
+        
+        with patch.object(content_extractor, 'take_extraction_screenshot') as mock_screenshot:
+            movie = await content_extractor.extract_movie_data(page)
+        
+        assert movie.title is None
+        assert movie.booking_url is None
+        assert movie.source_url == page.url
+        assert movie.extracted_at is not None
+        mock_screenshot.assert_awaited_once_with(page)
+    
+    @pytest.mark.asyncio
+    async def test_validate_extracted_data(self, content_extractor):
+        """Test validation reports missing fields and malformed values."""
+        complete = MovieData(
+            title="Stand by Me",
+            screening_datetime="2026-05-28 19:00",
+            location="Borås Bio Röda Kvarn",
+            booking_url="https://bio.se/boka/123",
+            movie_url="https://www.boras.se/throwbackthursday/stand-by-me.html",
+        )
+        result = await content_extractor.validate_extracted_data(complete)
+        assert result == {'is_valid': True, 'missing_fields': [], 'warnings': []}
+        
+        partial = MovieData(title="Stand by Me", screening_datetime="28 maj", booking_url="/boka")
+        result = await content_extractor.validate_extracted_data(partial)
+        assert result['is_valid'] is False
+        assert result['missing_fields'] == ['location']
+        assert len(result['warnings']) == 3
+
+
+class TestGatherOrCancel:
+    """Test cases for the browser scraper's concurrent page waits."""
+    
+    @pytest.mark.asyncio
+    async def test_failure_cancels_remaining_waits(self):
+        """Test a failing navigation cancels the waits still running on the page."""
+        from src.browser_scraper import _gather_or_cancel
+        
+        async def navigate():
+            raise RuntimeError("Navigation failed")
+        
+        wait_cancelled = asyncio.Event()
+        
+        async def wait_on_page():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                wait_cancelled.set()
+                raise
+        
+        with pytest.raises(RuntimeError):
+            await _gather_or_cancel(navigate(), wait_on_page())
+        assert wait_cancelled.is_set()
+
+
 class TestDataModels:
     """Test cases for data models."""
     
@@ -1,34 +1,64 @@
+import json
 import pytest
-import requests
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from bs4 import BeautifulSoup
-from unittest.mock import patch, mock_open
-from src.checker import WebChecker
+from lxml.html import HtmlElement
+from unittest.mock import AsyncMock, MagicMock, patch, mock_open
+from src.checker import DictBackend, WebChecker
 
 
 @pytest.fixture
 def web_checker():
     return WebChecker(url="http://example.com", db_file_path="db.json")
 
-def test_download_html(web_checker):
-    with patch('requests.get') as mock_get:
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.text = "<html></html>"
-        html = web_checker.download_html("http://example.com")
-        assert html == "<html></html>"
+def _mock_session(status=200, body=b""):
+    response = MagicMock(status=status, headers={})
+    response.read = AsyncMock(return_value=body)
+    session = MagicMock(closed=False)
+    session.get.return_value.__aenter__.return_value = response
+    return session
+
+async def test_download_html():
+    session = _mock_session(body=b"<html></html>")
+    web_checker = WebChecker(url="http://example.com", db_file_path="db.json", session=session)
+    status, html, _ = await web_checker.download_html("http://example.com")
+    assert (status, html) == (200, b"<html></html>")
+
+    # A second download goes through the same injected session
+    await web_checker.download_html("http://example.com")
+    assert session.get.call_count == 2
+
+async def test_download_html_not_modified():
+    session = _mock_session(status=304)
+    web_checker = WebChecker(url="http://example.com", db_file_path="db.json", session=session)
+    headers = web_checker.get_conditional_headers({"etag": '"abc"'})
+    status, html, _ = await web_checker.download_html("http://example.com", headers)
+    assert (status, html) == (304, b"")
+    assert session.get.call_args.kwargs['headers'] == {"If-None-Match": '"abc"'}
+    session.get.return_value.__aenter__.return_value.read.assert_not_awaited()
+
+def test_get_validators(web_checker):
+    headers = {"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT", "Server": "x"}
+    validators = web_checker.get_validators(headers)
+    assert validators == {"etag": '"abc"', "last_modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+def test_get_conditional_headers(web_checker):
+    http_cache = {"etag": '"abc"', "last_modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    headers = web_checker.get_conditional_headers(http_cache)
+    assert headers == {"If-None-Match": '"abc"', "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT"}
+    assert web_checker.get_conditional_headers({}) == {}
 
 def test_html_to_soup(web_checker):
     html = "<html><body></body></html>"
     soup = web_checker.html_to_soup(html)
-    assert isinstance(soup, BeautifulSoup)
+    assert isinstance(soup, HtmlElement)
 
 def test_get_element_by_class(web_checker):
     html = '<div class="test-class">Content</div>'
     soup = web_checker.html_to_soup(html)
     element = web_checker.get_element_by_class("test-class", soup)
-    assert element.get_text() == "Content"
+    assert element.text_content() == "Content"
 
 def test_get_site_last_changed_date(web_checker):
     html = '<div class="sv-font-uppdaterad-info-ny"><time datetime="2023-01-01T00:00:00Z"></time></div>'
@@ -36,16 +66,32 @@ def test_get_site_last_changed_date(web_checker):
     last_changed_date = web_checker.get_site_last_changed_date(soup)
     assert last_changed_date == "2023-01-01T00:00:00Z"
 
-def test_get_db_last_changed_date(web_checker):
-    with patch("builtins.open", mock_open(read_data='{"last_changed_date": "2023-01-01T00:00:00Z"}')):
-        last_changed_date = web_checker.get_db_last_changed_date()
-        assert last_changed_date == "2023-01-01T00:00:00Z"
+def test_get_site_last_changed_date_bytes(web_checker):
+    html = b'<div class="sv-font-uppdaterad-info-ny"><strong>Senast \xc3\xa4ndrad:</strong> <time datetime="2023-01-01T00:00:00Z">1 januari</time></div>'
+    assert web_checker.get_site_last_changed_date_bytes(html) == "2023-01-01T00:00:00Z"
+    assert web_checker.get_site_last_changed_date_bytes(b"<html></html>") is None
+
+async def test_open_db_file():
+    backend = DictBackend({"last_changed_date": "2023-01-01T00:00:00Z"})
+    web_checker = WebChecker(url="http://example.com", db_file_path="db.json", db_backend=backend)
+    data = await web_checker.open_db_file()
+    assert data.get('last_changed_date') == "2023-01-01T00:00:00Z"
+
+async def test_write_db_file_to_backend():
+    backend = DictBackend()
+    web_checker = WebChecker(url="http://example.com", db_file_path="db.json", db_backend=backend)
+    await web_checker.write_db_file({"last_changed_date": "2023-01-01T00:00:00Z"})
+    assert backend.data == {"last_changed_date": "2023-01-01T00:00:00Z"}
 
 def test_datestring_to_datetime(web_checker):
     datestring = "2023-01-01T00:00:00Z"
     dt = web_checker.datestring_to_datetime(datestring)
     assert dt.isoformat() == "2023-01-01T00:00:00+00:00"
 
+def test_datestring_to_datetime_non_iso(web_checker):
+    dt = web_checker.datestring_to_datetime("Jan 1, 2023 10:30")
+    assert dt.isoformat() == "2023-01-01T10:30:00"
+
 def test_get_movie_url(web_checker):
     html = '<div class="sv-channel-item"><a href="/movie"></a></div>'
     soup = web_checker.html_to_soup(html)
@@ -68,7 +114,7 @@ def test_get_screening_datetime(web_checker):
     html = '<strong>Tid:</strong><time datetime="2023-01-01T00:00:00"></time>'
     soup = web_checker.html_to_soup(html)
     screening_datetime = web_checker.get_screening_datetime(soup)
-    assert screening_datetime.isoformat() == "2023-01-01T00:00:00"
+    assert screening_datetime == "2023-01-01 00:00"
 
 def test_get_screening_location(web_checker):
     html = '<p class="sv-font-ny-brodtext"><strong>Tid:</strong> <time datetime="2025-02-20T19:00:00+01:00">2025-02-20 19.00</time><br><strong>Plats: </strong>Location</p>'
@@ -76,14 +122,155 @@ def test_get_screening_location(web_checker):
     screening_location = web_checker.get_screening_location(soup)
     assert screening_location == "Location"
 
-def test_open_db_file_not_found(web_checker):
+def test_extract_movie_fields(web_checker):
+    html = (
+        '<div class="sidrubrik">Throwback Thursday: "Movie Title" (1986)</div>'
+        '<p class="sv-font-ny-brodtext"><strong>Tid:</strong> <time datetime="2025-02-20T19:00:00+01:00">2025-02-20 19.00</time><br><strong>Plats: </strong>Location</p>'
+        '<a href="http://example.com/booking" rel="external"><strong>Köp biljett</strong></a>'
+    )
+    soup = web_checker.html_to_soup(html)
+    fields = web_checker._extract_movie_fields(soup)
+    assert fields == {
+        'title': "Movie Title",
+        'screening_datetime': "2025-02-20 19:00",
+        'location': "Location",
+        'booking_url': "http://example.com/booking",
+    }
+
+def test_extract_all(web_checker):
+    html = (
+        '<div class="sv-font-uppdaterad-info-ny"><time datetime="2023-01-01T00:00:00">Jan 1, 2023</time></div>'
+        '<div class="sv-channel-item"><a href="/movie">Movie</a></div>'
+        '<div class="sidrubrik">"Movie Title"</div>'
+        '<p><strong>Tid:</strong> <time datetime="2025-02-20T19:00:00+01:00">2025-02-20 19.00</time><br><strong>Plats: </strong>Location</p>'
+        '<a href="http://example.com/booking"><strong>Köp biljett</strong></a>'
+    )
+    expected = {
+        'last_changed_date': "2023-01-01T00:00:00",
+        'movie_url': "http://example.com/movie",
+        'title': "Movie Title",
+        'screening_datetime': "2025-02-20 19:00",
+        'location': "Location",
+        'booking_url': "http://example.com/booking",
+    }
+    assert web_checker.extract_all(html) == expected
+    assert web_checker.extract_all(web_checker.html_to_soup(html)) == expected
+
+async def test_open_db_file_not_found(web_checker):
     with patch("builtins.open", side_effect=FileNotFoundError):
-        data = web_checker.open_db_file()
+        data = await web_checker.open_db_file()
         assert data == {}
 
-def test_write_db_file(web_checker):
+async def test_write_db_file(web_checker):
+    json_data = {"key": "value"}
+    with patch("builtins.open", mock_open()) as mock_file:
+        await web_checker.write_db_file(json_data)
+        mock_file.assert_called_once()
+        assert mock_file.call_args.args[0] == 'db.json'
+        written = mock_file().write.call_args.args[0]
+        assert json.loads(written) == json_data
+
+async def test_write_db_file_skips_unchanged_data(web_checker):
     json_data = {"key": "value"}
     with patch("builtins.open", mock_open()) as mock_file:
-        web_checker.write_db_file(json_data)
-        mock_file.assert_called_once_with('db.json', 'w')
-        mock_file().write.assert_called_once_with('{"key": "value"}')
+        await web_checker.write_db_file(json_data)
+        await web_checker.write_db_file(dict(json_data))
+        mock_file.assert_called_once()
+
+def _routing_session(pages):
+    # Serves (status, body, headers) per URL for both GET and HEAD
+    def respond(url, headers=None):
+        status, body, response_headers = pages[url]
+        response = MagicMock(status=status, headers=response_headers)
+        response.read = AsyncMock(return_value=body)
+        context = MagicMock()
+        context.__aenter__.return_value = response
+        return context
+    session = MagicMock(closed=False)
+    session.get.side_effect = respond
+    session.head.side_effect = respond
+    return session
+
+def _index_html(last_changed, movie_href):
+    return (
+        f'<div class="sv-channel-item"><a href="{movie_href}">Movie</a></div>'
+        f'<div class="sv-font-uppdaterad-info-ny"><strong>Senast ändrad:</strong> '
+        f'<time datetime="{last_changed}">1 januari</time></div>'
+    ).encode()
+
+MOVIE_HTML = (
+    '<div class="sidrubrik">Throwback Thursday: "Movie Title" (1986)</div>'
+    '<p><strong>Tid:</strong> <time datetime="2025-02-20T19:00:00+01:00">2025-02-20 19.00</time><br><strong>Plats: </strong>Location</p>'
+    '<a href="http://example.com/booking"><strong>Köp biljett</strong></a>'
+).encode()
+
+STORED_DB = {
+    'last_changed_date': "2025-01-01T10:00:00+01:00",
+    'latest_movie_data': {'title': "Old Title", 'movie_url': "http://example.com/movie"},
+    'http_cache': {'etag': '"v1"'},
+}
+
+def _go_checker(pages):
+    backend = DictBackend(json.loads(json.dumps(STORED_DB)))
+    session = _routing_session(pages)
+    web_checker = WebChecker(url="http://example.com", db_file_path="db.json", session=session, db_backend=backend)
+    web_checker.notifier = MagicMock()
+    return web_checker, session, backend
+
+async def test_go_unchanged_etag():
+    web_checker, session, backend = _go_checker({"http://example.com": (200, b"", {'ETag': '"v1"'})})
+    stored = backend.data
+    await web_checker.go()
+    session.head.assert_called_once()
+    session.get.assert_not_called()
+    assert backend.data is stored  # never saved
+    assert web_checker.notifier.mock_calls == []
+
+async def test_go_changed_etag_same_timestamp():
+    index = _index_html(STORED_DB['last_changed_date'], "/movie")
+    web_checker, session, backend = _go_checker({"http://example.com": (200, index, {'ETag': '"v2"'})})
+    await web_checker.go()
+    assert [c.args[0] for c in session.get.call_args_list] == ["http://example.com"]
+    assert backend.data['http_cache'] == {'etag': '"v2"'}
+    assert backend.data['last_changed_date'] == STORED_DB['last_changed_date']
+    assert web_checker.notifier.mock_calls == []
+
+async def test_go_new_timestamp_same_movie():
+    index = _index_html("2025-02-01T10:00:00+01:00", "/movie")
+    web_checker, session, backend = _go_checker({"http://example.com": (200, index, {'ETag': '"v2"'})})
+    await web_checker.go()
+    assert [c.args[0] for c in session.get.call_args_list] == ["http://example.com"]
+    assert backend.data['last_changed_date'] == "2025-02-01T10:00:00+01:00"
+    assert backend.data['latest_movie_data'] == STORED_DB['latest_movie_data']
+    assert web_checker.notifier.mock_calls == []
+
+async def test_go_new_movie():
+    index = _index_html("2025-02-01T10:00:00+01:00", "/movie2")
+    web_checker, session, backend = _go_checker({
+        "http://example.com": (200, index, {'ETag': '"v2"'}),
+        "http://example.com/movie2": (200, MOVIE_HTML, {}),
+    })
+    await web_checker.go()
+    assert [c.args[0] for c in session.get.call_args_list] == ["http://example.com", "http://example.com/movie2"]
+    assert backend.data['latest_movie_data'] == {
+        'title': "Movie Title",
+        'screening_datetime': "2025-02-20 19:00",
+        'location': "Location",
+        'booking_url': "http://example.com/booking",
+        'movie_url': "http://example.com/movie2",
+    }
+    assert backend.data['http_cache'] == {'etag': '"v2"'}
+    web_checker.notifier.send_embed.assert_called_once()
+    web_checker.notifier.send_message.assert_not_called()
+
+async def test_go_null_latest_movie_data():
+    index = _index_html("2025-02-01T10:00:00+01:00", "/movie")
+    web_checker, session, backend = _go_checker({
+        "http://example.com": (200, index, {'ETag': '"v2"'}),
+        "http://example.com/movie": (200, MOVIE_HTML, {}),
+    })
+    backend.data['latest_movie_data'] = None
+    await web_checker.go()
+    assert backend.data['latest_movie_data']['movie_url'] == "http://example.com/movie"
+    web_checker.notifier.send_embed.assert_called_once()
+    web_checker.notifier.send_message.assert_not_called()
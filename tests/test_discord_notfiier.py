@@ -54,9 +54,18 @@
 #     with pytest.raises(Exception):
 #         notifier.send_message("Test message")
 
+import asyncio
 import pytest
-from unittest.mock import patch, MagicMock
-from src.discord_notifier import DiscordNotifier
+from unittest.mock import patch, MagicMock, AsyncMock
+from yarl import URL
+from src.discord_notifier import DiscordNotifier, get_webhook_url
+
+@pytest.fixture(autouse=True)
+def clear_webhook_url_cache():
+    """Re-read the environment in every test (the URL is cached per process)"""
+    get_webhook_url.cache_clear()
+    yield
+    get_webhook_url.cache_clear()
 
 @pytest.fixture
 def mock_env_vars():
@@ -76,21 +85,54 @@ def test_init_with_missing_webhook_url():
         notifier = DiscordNotifier()
         assert notifier.webhook_url is None
 
-@patch('discord_webhook.DiscordWebhook.execute')
-def test_send_message(mock_execute, notifier):
-    mock_execute.return_value = None
-    notifier.send_message("Test message")
-    mock_execute.assert_called_once()
+def _mock_post(status=204, text=""):
+    """Patch aiohttp's post with an async context manager returning a response."""
+    response = MagicMock(status=status)
+    response.text = AsyncMock(return_value=text)
+    post = MagicMock()
+    post.return_value.__aenter__.return_value = response
+    return patch('aiohttp.ClientSession.post', post)
 
-@patch('discord_webhook.DiscordWebhook')
-def test_send_message_content(mock_webhook, notifier):
-    mock_webhook_instance = MagicMock()
-    mock_webhook.return_value = mock_webhook_instance
-    
+async def test_send_message(notifier):
+    with _mock_post() as mock_post:
+        notifier.send_message("Test message")
+        await notifier.close()
+    mock_post.assert_called_once()
+
+async def test_send_message_content(notifier):
     test_message = "Test message"
-    notifier.send_message(test_message)
+    with _mock_post() as mock_post:
+        notifier.send_message(test_message)
+        await notifier.close()
+    
+    args, kwargs = mock_post.call_args
+    assert args == (URL('https://discord.webhook.test'),)
+    assert args[0] is notifier._webhook_url
+    assert kwargs['json']['content'] == test_message
+
+async def test_send_embed_payload(notifier):
+    embed = {'title': 'New Screening: Test', 'description': 'desc', 'color': 0x00FF00}
+    with _mock_post() as mock_post:
+        notifier.send_embed(embed)
+        await notifier.close()
     
-    mock_webhook.assert_called_with(
-        url='https://discord.webhook.test',
-        content=test_message
-    )
\ No newline at end of file
+    _, kwargs = mock_post.call_args
+    assert kwargs['json'] == {'embeds': [embed]}
+
+
+async def test_send_message_failure_is_reported_on_flush(notifier, capsys):
+    with patch('aiohttp.ClientSession.post', side_effect=ConnectionError("down")):
+        notifier.send_message("Test message")
+        await notifier.flush()
+    await notifier.close()
+    
+    assert "ConnectionError: down" in capsys.readouterr().out
+
+async def test_send_message_failure_is_reported_before_flush(notifier, capsys):
+    with patch('aiohttp.ClientSession.post', side_effect=ConnectionError("down")):
+        notifier.send_message("Test message")
+        # Let the send finish (and fail) before anything flushes
+        await asyncio.sleep(0.05)
+        assert "ConnectionError: down" in capsys.readouterr().out
+        await notifier.flush()
+    await notifier.close()